@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
 from .routers.accounts import router as accounts_router
 from .routers.health import router as health_router
@@ -11,6 +12,9 @@ from .routers.performance import router as perf_router
 
 app = FastAPI(title="Algoforce Performance Metrics API", version="dev 10.24.25.2")
 
+# The metrics payload is large, highly repetitive float dicts; small bodies skip compression
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(health_router)
 app.include_router(accounts_router)
 app.include_router(perf_router, prefix="/v1")
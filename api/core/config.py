@@ -21,13 +21,14 @@ def now_utc_iso() -> str:
 
 
 # ---------- Redis ----------
+@lru_cache(maxsize=1)
 def get_redis() -> Redis:
-    """Return a Redis client (decode_responses=True)."""
+    """Return the process-wide Redis client; values come back as raw bytes."""
     # Lazy import for optional runtime dependency.
     import redis  # type: ignore
 
     url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    return redis.from_url(url, decode_responses=True)  # type: ignore[no-any-return]
+    return redis.from_url(url, decode_responses=False)  # type: ignore[no-any-return]
 
 
 # ---------- SQL ----------
@@ -38,12 +39,22 @@ DB_URL: Final[str] = os.getenv(
 BALANCE_SCHEMA: Final[str] = os.getenv("BALANCE_SCHEMA", "balance")
 BALANCE_TIME_COLUMN: Final[str] = os.getenv("BALANCE_TIME_COLUMN", "datetime")
 BALANCE_VALUE_COLUMN: Final[str] = os.getenv("BALANCE_VALUE_COLUMN", "overall_balance")
+# Upper bound on concurrent per-account reads; the engine pool is sized to match.
+SQL_MAX_WORKERS: Final[int] = int(os.getenv("SQL_MAX_WORKERS", "16"))
+# Seconds a per-account MTD ledger read stays in Redis; 0 disables the cache.
+LEDGER_CACHE_TTL: Final[int] = int(os.getenv("LEDGER_CACHE_TTL", "30"))
 
 
 @lru_cache(maxsize=1)
 def get_engine() -> Engine:
-    """Return a cached SQLAlchemy Engine."""
-    return create_engine(DB_URL, pool_pre_ping=True, pool_recycle=3600)
+    """Return a cached SQLAlchemy Engine with a pool sized for per-account fan-out."""
+    return create_engine(
+        DB_URL,
+        pool_size=SQL_MAX_WORKERS,
+        max_overflow=8,
+        pool_pre_ping=False,
+        pool_recycle=1800,
+    )
 
 
 # ---------- unrealized.json (env override + fallbacks) ----------
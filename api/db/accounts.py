@@ -3,17 +3,34 @@
 
 from __future__ import annotations
 
-import json
+import os
+from functools import lru_cache
 from typing import Any
 
+import orjson
+
 from ..core.config import ACCOUNTS_JSON_PATH
 
 
 def read_accounts_file() -> list[dict[str, Any]]:
-    """Load api/data/accounts.json (or ACCOUNTS_JSON_PATH override)."""
+    """Load api/data/accounts.json (or ACCOUNTS_JSON_PATH override).
+
+    Parsed once per file version: the cache is keyed on path, mtime and size, so an
+    edited accounts list is served on the next request. Callers get their own dicts,
+    so mutating one cannot leak into the cached copy.
+    """
+    try:
+        st = os.stat(ACCOUNTS_JSON_PATH)
+    except OSError:
+        return []
+    return [dict(x) for x in _load_accounts(ACCOUNTS_JSON_PATH, st.st_mtime_ns, st.st_size)]
+
+
+@lru_cache(maxsize=1)
+def _load_accounts(path: str, _mtime_ns: int, _size: int) -> list[dict[str, Any]]:
     try:
-        with open(ACCOUNTS_JSON_PATH, encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
     except Exception:
         return []
     if not isinstance(data, list):
@@ -3,10 +3,11 @@
 
 from __future__ import annotations
 
-import json
 import os
 from functools import lru_cache
 
+import orjson
+
 from ..core.config import unrealized_candidates
 
 
@@ -17,15 +18,24 @@ def _first_existing_path(paths: list[str]) -> str | None:
     return None
 
 
-@lru_cache(maxsize=1)
 def read_unrealized_json() -> dict[str, float]:
     """Read unrealized.json into {account: value}, lowercase keys. Env override + fallbacks."""
     path = _first_existing_path(unrealized_candidates())
     if not path:
         return {}
     try:
-        with open(path, encoding="utf-8") as f:
-            obj = json.load(f)
+        st = os.stat(path)
+    except OSError:
+        return {}
+    # Re-parsed only when the file changes; the copy keeps the cached dict intact
+    return dict(_load_unrealized(path, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=1)
+def _load_unrealized(path: str, _mtime_ns: int, _size: int) -> dict[str, float]:
+    try:
+        with open(path, "rb") as f:
+            obj = orjson.loads(f.read())
         if not isinstance(obj, dict):
             return {}
         out: dict[str, float] = {}
@@ -1,45 +1,54 @@
 # api/db/redis.py
-"""Redis helpers for live unrealized PnL (uPnL)."""
+"""Redis helpers for live unrealized PnL (uPnL) and short-lived result caching."""
 
 from __future__ import annotations
 
-import json
-from collections.abc import Iterable, Sequence
+import math
+import threading
+from collections.abc import Iterable, Mapping, Sequence
 
-import pandas as pd
+import orjson
+from cachetools import TTLCache, cached
 
 from ..core.config import get_redis, now_utc_iso
 
+# Live positions are refreshed by the writer every few seconds; concurrent dashboard polls
+# within that window share one MGET + parse. Keyed by the accounts tuple.
+_UPNL_CACHE: TTLCache[tuple[str, ...], dict[str, float]] = TTLCache(maxsize=64, ttl=2.0)
+_UPNL_LOCK = threading.Lock()
 
-def _decode(value: object) -> str | None:
-    """Return a UTF-8 string from a Redis value (str/bytes/bytearray), else None."""
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    dec = getattr(value, "decode", None)
-    if callable(dec):
-        try:
-            out = dec("utf-8")
-            return out if isinstance(out, str) else None
-        except Exception:
-            return None
-    return None
-
-
-def _sum_unrealized(text_payload: str | None) -> float:
-    """Parse JSON array and sum `unrealizedProfit`; return 0.0 if unknown."""
-    if not text_payload:
+
+def _payload(value: object) -> bytes | str | None:
+    """Return a raw Redis value as-is when it is bytes/str, else None."""
+    return value if isinstance(value, bytes | str) else None
+
+
+def _to_float(value: object) -> float:
+    """float(value); null, non-numeric and NaN values count as 0.0."""
+    try:
+        out = float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0.0
+    return out if out == out else 0.0
+
+
+def _sum_unrealized(payload: bytes | str | None) -> float:
+    """Parse JSON array and sum `unrealizedProfit`; return 0.0 if unknown.
+
+    orjson parses the raw bytes and fsum adds the field; no frame is built for what
+    is a handful of positions per account.
+    """
+    if not payload:
         return 0.0
     try:
-        parsed = json.loads(text_payload)
-        frame = pd.DataFrame(parsed)
-        if frame.empty or "unrealizedProfit" not in frame.columns:
-            return 0.0
-        ser = pd.to_numeric(frame["unrealizedProfit"], errors="coerce").fillna(0.0)
-        return float(ser.sum())
-    except Exception:
+        rows = orjson.loads(payload)
+    except orjson.JSONDecodeError:
         return 0.0
+    if not isinstance(rows, list):
+        return 0.0
+    return math.fsum(
+        _to_float(row.get("unrealizedProfit")) for row in rows if isinstance(row, dict)
+    )
 
 
 def _normalize_mget_result(result: object) -> list[object]:
@@ -66,10 +75,18 @@ def _normalize_mget_result(result: object) -> list[object]:
 
 
 def read_upnl(accounts: Sequence[str]) -> dict[str, float]:
-    """Read unrealized PnL from Redis `{account}_live`. Returns map + 'total' key."""
+    """Read unrealized PnL from Redis `{account}_live`. Returns map + 'total' key.
+
+    Results are cached for 2s per accounts tuple; callers get their own copy.
+    """
     if not accounts:
         return {"total": 0.0}
+    return dict(_read_upnl_cached(tuple(accounts)))
 
+
+@cached(_UPNL_CACHE, lock=_UPNL_LOCK)
+def _read_upnl_cached(accounts: tuple[str, ...]) -> dict[str, float]:
+    """Single MGET over `{account}_live` keys, summed per account."""
     r = get_redis()
     keys: list[str] = [f"{a}_live" for a in accounts]
 
@@ -85,7 +102,7 @@ def read_upnl(accounts: Sequence[str]) -> dict[str, float]:
     out: dict[str, float] = {}
     total = 0.0
     for acc, raw in zip(accounts, raws, strict=False):
-        val = _sum_unrealized(_decode(raw))
+        val = _sum_unrealized(_payload(raw))
         out[str(acc)] = val
         total += val
 
@@ -93,9 +110,40 @@ def read_upnl(accounts: Sequence[str]) -> dict[str, float]:
     return out
 
 
-def upnl_payload(accounts: Sequence[str]) -> dict[str, object]:
-    """Return API block for uPnl: {asOf, perAccount, combined}."""
-    m = read_upnl(accounts)
+def cache_get_many(keys: Sequence[str]) -> list[bytes | str | None]:
+    """Return cached values for `keys` with one MGET; misses and Redis errors give None."""
+    if not keys:
+        return []
+    try:
+        raws = _normalize_mget_result(get_redis().mget(list(keys)))
+    except Exception:
+        raws = []
+    if len(raws) != len(keys):
+        return [None] * len(keys)
+    return [_payload(raw) for raw in raws]
+
+
+def cache_set_many(items: Mapping[str, bytes | str], ttl: int) -> None:
+    """Store every key/value for `ttl` seconds in one pipelined round trip; errors ignored."""
+    if not items:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.setex(key, ttl, value)
+        pipe.execute()
+    except Exception:
+        pass
+
+
+def upnl_payload(
+    accounts: Sequence[str], upnl_map: Mapping[str, float] | None = None
+) -> dict[str, object]:
+    """Return API block for uPnl: {asOf, perAccount, combined}.
+
+    Pass an already-read `upnl_map` to skip the Redis round-trip.
+    """
+    m = read_upnl(accounts) if upnl_map is None else upnl_map
     per = {a: float(m.get(a, 0.0)) for a in accounts}
     return {
         "asOf": now_utc_iso(),
@@ -3,12 +3,17 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import wraps
+from typing import ParamSpec, TypeVar
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 
 from ..core.config import (
     BALANCE_SCHEMA,
@@ -17,135 +22,202 @@ from ..core.config import (
     get_engine,
 )
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _retry_on_disconnect(fn: Callable[P, R]) -> Callable[P, R]:
+    """Run `fn` again once if its pooled connection turned out to be dead.
+
+    The engine does not pre-ping, so a connection the server dropped surfaces as an
+    invalidated DBAPIError; the pool discards it and the retry checks out a fresh one.
+    """
+
+    @wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        try:
+            return fn(*args, **kwargs)
+        except DBAPIError as exc:
+            if not exc.connection_invalidated:
+                raise
+        return fn(*args, **kwargs)
+
+    return wrapper
+
 
 def _sql_to_df(
     conn: Connection, stmt: str, params: Mapping[str, object] | None = None
 ) -> DataFrame:
-    """Execute SQL and materialize a DataFrame."""
+    """Execute SQL and materialize a DataFrame; DECIMAL cells come back as floats."""
     q = text(stmt)
     res = conn.execute(q, params or {})
     try:
         cols = list(res.keys())
-        rows = [dict(m) for m in res.mappings().all()]
-        return pd.DataFrame(rows, columns=cols)
+        rows = res.fetchall()
+        if not rows:
+            return DataFrame(columns=cols)
+        return pd.DataFrame.from_records(rows, columns=cols, coerce_float=True)
     finally:
         res.close()
 
 
+def _read_window(stmt: str, start_dt: str, end_dt: str) -> DataFrame:
+    """Run a `:start`/`:end` windowed read on a pooled connection, with bound parameters."""
+    with get_engine().connect() as conn:
+        return _sql_to_df(conn, stmt, {"start": start_dt, "end": end_dt})
+
+
+# Empty results of the windowed readers, built once; callers get a copy
+_EMPTY_TRADES = DataFrame(
+    columns=["symbol", "realizedPnl"], index=pd.DatetimeIndex([], name="time")
+)
+_EMPTY_TRANSACTIONS = DataFrame(
+    columns=["incomeType", "income"], index=pd.DatetimeIndex([], name="time")
+)
+_EMPTY_EARNINGS = DataFrame(columns=["rewards"], index=pd.DatetimeIndex([], name="time"))
+
+
+def _time_indexed(df: DataFrame) -> DataFrame:
+    """Index a windowed read by its `time` column, dropping unparseable stamps.
+
+    The readers ask MySQL for ORDER BY time, so the sort only runs as a fallback.
+    """
+    df["time"] = pd.to_datetime(df["time"], errors="coerce", cache=True)
+    df = df.dropna(subset=["time"]).set_index("time")
+    return df if df.index.is_monotonic_increasing else df.sort_index()
+
+
 def _coerce_float(x: object) -> float:
-    """Robust scalar→float conversion that keeps type checkers quiet."""
-    if isinstance(x, int | float):
-        return float(x)
+    """Robust scalar→float conversion; null, non-numeric and NaN give 0.0."""
+    if x is None:
+        return 0.0
     try:
-        s = pd.Series([x])
-        v = pd.to_numeric(s, errors="coerce").iloc[0]
-        return float(v) if pd.notna(v) else 0.0
-    except Exception:
+        v = float(x)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
         return 0.0
+    return v if v == v else 0.0
 
 
-def _coerce_ts(x: object, *, default: pd.Timestamp) -> pd.Timestamp:
-    """Coerce a single value to pd.Timestamp; fallback to provided default.
+@_retry_on_disconnect
+def balances_on_or_before(accounts: Sequence[str], start_ts: pd.Timestamp) -> dict[str, float]:
+    """Return {account: balance} of the nearest snapshot <= start_ts, in one round-trip.
 
-    Uses a Series-based path to satisfy pandas-stubs overloads for to_datetime.
+    Each account contributes two single-row arms to one UNION ALL (the snapshot at or
+    before start_ts, then the earliest snapshot as fallback); the first arm present
+    wins. Accounts without any snapshot map to 0.0.
     """
-    try:
-        s = pd.Series([x])
-        ts_series = pd.to_datetime(s, errors="coerce")
-        ts0 = ts_series.iloc[0]
-        if isinstance(ts0, pd.Timestamp) and not pd.isna(ts0):
-            return ts0
-    except Exception:
-        pass
-    return default
-
-
-def nearest_balance_on_or_before(
-    account: str, start_ts: pd.Timestamp
-) -> tuple[float, pd.Timestamp]:
-    """Return (balance, timestamp) for nearest snapshot <= start_ts; fallback to earliest."""
-    eng = get_engine()
-    with eng.connect() as conn:
-        q1 = (
-            f"SELECT `{BALANCE_TIME_COLUMN}` AS ts, `{BALANCE_VALUE_COLUMN}` AS bal "
-            f"FROM `{BALANCE_SCHEMA}`.`{account}_balance` "
+    accs = list(dict.fromkeys(accounts))
+    if not accs:
+        return {}
+    cols = f"`{BALANCE_TIME_COLUMN}` AS ts, `{BALANCE_VALUE_COLUMN}` AS bal"
+    arms: list[str] = []
+    params: dict[str, object] = {"start": f"{start_ts:%Y-%m-%d %H:%M:%S}"}
+    for i, acc in enumerate(accs):
+        table = f"`{BALANCE_SCHEMA}`.`{acc}_balance`"
+        params[f"a{i}"] = acc
+        arms.append(
+            f"(SELECT :a{i} AS acc, 0 AS pri, {cols} FROM {table} "
             f"WHERE `{BALANCE_TIME_COLUMN}` <= :start "
-            f"ORDER BY `{BALANCE_TIME_COLUMN}` DESC LIMIT 1"
+            f"ORDER BY `{BALANCE_TIME_COLUMN}` DESC LIMIT 1)"
         )
-        df = _sql_to_df(conn, q1, {"start": f"{start_ts:%Y-%m-%d %H:%M:%S}"})
-        if not df.empty:
-            bal = _coerce_float(df.at[0, "bal"])
-            ts = _coerce_ts(df.at[0, "ts"], default=start_ts)
-            return bal, ts
-
-        q2 = (
-            f"SELECT `{BALANCE_TIME_COLUMN}` AS ts, `{BALANCE_VALUE_COLUMN}` AS bal "
-            f"FROM `{BALANCE_SCHEMA}`.`{account}_balance` "
-            f"ORDER BY `{BALANCE_TIME_COLUMN}` ASC LIMIT 1"
+        arms.append(
+            f"(SELECT :a{i} AS acc, 1 AS pri, {cols} FROM {table} "
+            f"ORDER BY `{BALANCE_TIME_COLUMN}` ASC LIMIT 1)"
         )
-        df2 = _sql_to_df(conn, q2)
-        if df2.empty:
-            return 0.0, start_ts
-        bal2 = _coerce_float(df2.at[0, "bal"])
-        ts2 = _coerce_ts(df2.at[0, "ts"], default=start_ts)
-        return bal2, ts2
+    eng = get_engine()
+    with eng.connect() as conn:
+        df = _sql_to_df(conn, " UNION ALL ".join(arms), params)
+
+    out = dict.fromkeys(accs, 0.0)
+    if df.empty:
+        return out
+    df = df.sort_values("pri", kind="stable").drop_duplicates("acc", keep="first")
+    for acc, bal in zip(df["acc"].astype(str), df["bal"], strict=True):
+        out[acc] = _coerce_float(bal)
+    return out
 
 
+@_retry_on_disconnect
 def read_trades(account: str, start_dt: str, end_dt: str) -> DataFrame:
-    """Trades with realizedPnl net of commission; index=time."""
-    eng = get_engine()
+    """Trades (symbol, realizedPnl net of commission); index=time."""
     sql = (
-        "SELECT symbol, id, orderId, side, price, qty, realizedPnl, commission, time, positionSide "
-        f"FROM `{account}` WHERE time >= :start AND time <= :end"
+        "SELECT symbol, COALESCE(realizedPnl, 0) - COALESCE(commission, 0) AS realizedPnl, "
+        f"time FROM `{account}` WHERE time >= :start AND time <= :end ORDER BY time"
     )
-    with eng.connect() as conn:
-        df = _sql_to_df(conn, sql, {"start": start_dt, "end": end_dt})
+    df = _read_window(sql, start_dt, end_dt)
     if df.empty:
-        return DataFrame(columns=["symbol", "realizedPnl"]).set_index(
-            pd.DatetimeIndex([], name="time"),
-        )
-    df["time"] = pd.to_datetime(df["time"], errors="coerce")
-    df = df.dropna(subset=["time"]).set_index("time").sort_index()
-    pnl = pd.to_numeric(df["realizedPnl"], errors="coerce").fillna(0.0)
-    fee = pd.to_numeric(df["commission"], errors="coerce").fillna(0.0)
-    df["realizedPnl"] = pnl - fee
+        return _EMPTY_TRADES.copy()
+    df = _time_indexed(df)
+    df["realizedPnl"] = (
+        pd.to_numeric(df["realizedPnl"], errors="coerce").fillna(0.0).astype("float64")
+    )
     return df
 
 
+@dataclass(frozen=True, slots=True)
+class TradeColumns:
+    """Columnar view of a trades window: parallel arrays with one entry per fill.
+
+    Attributes:
+        ts_ns: int64 epoch-ns of each fill (tz-naive wall time, ascending).
+        pnl: float64 realizedPnl net of commission.
+        symbol: object array of symbol strings ("" where missing).
+    """
+
+    ts_ns: np.ndarray
+    pnl: np.ndarray
+    symbol: np.ndarray
+
+    @property
+    def empty(self) -> bool:
+        """True when the window holds no fills."""
+        return self.ts_ns.size == 0
+
+    def between(self, start_dt: str, end_dt: str) -> TradeColumns:
+        """Fills with start_dt <= time <= end_dt, matching the `read_trades` window."""
+        lo = np.searchsorted(self.ts_ns, pd.Timestamp(start_dt).value, side="left")
+        hi = np.searchsorted(self.ts_ns, pd.Timestamp(end_dt).value, side="right")
+        return TradeColumns(self.ts_ns[lo:hi], self.pnl[lo:hi], self.symbol[lo:hi])
+
+
+def trade_columns(df: DataFrame) -> TradeColumns:
+    """Reduce a `read_trades` frame to the time/pnl/symbol columns metrics use, as arrays."""
+    return TradeColumns(
+        ts_ns=pd.DatetimeIndex(df.index).as_unit("ns").asi8,
+        pnl=pd.to_numeric(df["realizedPnl"], errors="coerce").fillna(0.0).to_numpy("float64"),
+        symbol=df["symbol"].fillna("").astype(str).to_numpy(dtype=object),
+    )
+
+
+@_retry_on_disconnect
 def read_transactions(account: str, start_dt: str, end_dt: str) -> DataFrame:
     """Transaction history: incomeType, income, time; index=time."""
-    eng = get_engine()
     sql = (
         "SELECT incomeType, income, time "
         f"FROM `transaction_history`.`{account}_transaction` "
-        "WHERE time >= :start AND time <= :end"
+        "WHERE time >= :start AND time <= :end ORDER BY time"
     )
-    with eng.connect() as conn:
-        df = _sql_to_df(conn, sql, {"start": start_dt, "end": end_dt})
+    df = _read_window(sql, start_dt, end_dt)
     if df.empty:
-        return DataFrame(columns=["incomeType", "income"]).set_index(
-            pd.DatetimeIndex([], name="time"),
-        )
-    df["time"] = pd.to_datetime(df["time"], errors="coerce")
-    df = df.dropna(subset=["time"]).set_index("time").sort_index()
+        return _EMPTY_TRANSACTIONS.copy()
+    df = _time_indexed(df)
     df["income"] = pd.to_numeric(df["income"], errors="coerce").fillna(0.0)
-    df["incomeType"] = df["incomeType"].astype(str)
+    # A handful of distinct types (FUNDING_FEE, TRANSFER, ...); kept as codes, not strings
+    df["incomeType"] = df["incomeType"].astype("category")
     return df
 
 
+@_retry_on_disconnect
 def read_earnings(account: str, start_dt: str, end_dt: str) -> DataFrame:
     """Earnings (rewards, time); index=time."""
-    eng = get_engine()
     sql = (
         "SELECT rewards, time "
         f"FROM `earnings`.`{account}_earnings` "
-        "WHERE time >= :start AND time <= :end"
+        "WHERE time >= :start AND time <= :end ORDER BY time"
     )
-    with eng.connect() as conn:
-        df = _sql_to_df(conn, sql, {"start": start_dt, "end": end_dt})
+    df = _read_window(sql, start_dt, end_dt)
     if df.empty:
-        return DataFrame(columns=["rewards"]).set_index(pd.DatetimeIndex([], name="time"))
-    df["time"] = pd.to_datetime(df["time"], errors="coerce")
-    df = df.dropna(subset=["time"]).set_index("time").sort_index()
+        return _EMPTY_EARNINGS.copy()
+    df = _time_indexed(df)
     df["rewards"] = pd.to_numeric(df["rewards"], errors="coerce").fillna(0.0)
     return df
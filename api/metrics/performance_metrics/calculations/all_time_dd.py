@@ -1,17 +1,25 @@
 # all_time_dd.py
+import numpy as np
 import pandas as pd
 
 from ....db.sql_v2 import get_data
+from ....utils.concurrency import map_accounts
+from .drawdown import drawdown_from_levels
 from .process_df import process_df
 
 
 def current_max_dd(accounts, oct_start, end_day) -> tuple[float, float]:
     """Returns (current_window_dd, all_time_mdd). Both floats. Raises on insufficient data."""
-    for acc in accounts:
-        balance = get_data(acc, "balance", "balance")
-        balance["datetime"] = pd.to_datetime(balance["datetime"])
-        balance.sort_values(by="datetime")
-        all_start = balance.iloc[0]["datetime"]
+    # Full history starts at the earliest snapshot of any account; the tables are read
+    # concurrently on the shared pool
+    firsts = map_accounts(
+        lambda acc: pd.to_datetime(get_data(acc, "balance", "balance")["datetime"]).min(),
+        list(accounts),
+    )
+    starts = [ts for ts in firsts.values() if not pd.isna(ts)]
+    if not starts:
+        raise ValueError("No balance history for the selected accounts.")
+    all_start = min(starts)
 
     # Full history
     _, all_daily, _ = process_df(accounts, all_start, end_day)
@@ -19,7 +27,6 @@ def current_max_dd(accounts, oct_start, end_day) -> tuple[float, float]:
         raise ValueError("No combined daily data for full history.")
 
     all_daily["date"] = pd.to_datetime(all_daily["date"], errors="coerce")
-    df_all = all_daily.sort_values("date").set_index("date")
     if "end_balance_combined" not in all_daily.columns:
         raise ValueError("Missing end_balance_combined in full-history frame.")
 
@@ -30,19 +37,23 @@ def current_max_dd(accounts, oct_start, end_day) -> tuple[float, float]:
     ):
         max_dd_all = float(all_daily["daily_drawdown_combined"].min())
     else:
-        bal_all = all_daily["end_balance_combined"].astype(float)
-        peaks_all = bal_all.cummax().replace(0.0, pd.NA)
-        max_dd_all = float(((bal_all - peaks_all) / peaks_all).min())
+        bal_all = all_daily["end_balance_combined"].to_numpy(dtype="float64")
+        max_dd_all = float(np.fmin.reduce(drawdown_from_levels(bal_all)))
 
     # Window current DD
     _, df_mtd, _ = process_df(accounts, oct_start, end_day)
-    _, df_all, _ = process_df(accounts, all_start, end_day)
-    df_all = df_all.sort_index()
-    df_mtd = df_mtd.sort_index()
-
-    df_all["peak"] = df_all["end_balance_combined"].cummax()
-    df_mtd["peak"] = df_all.loc[df_mtd.index, "peak"]
-    df_mtd["drawdown"] = (df_mtd["end_balance_combined"] - df_mtd["peak"]) / df_mtd["peak"]
-    current_dd = df_mtd["drawdown"].iloc[-1]
+    # Reuse the full-history frame built above instead of rebuilding every ledger again.
+    # process_df returns a RangeIndex, so both frames are keyed by date before aligning.
+    df_all = all_daily.set_index("date").sort_index()
+    df_mtd["date"] = pd.to_datetime(df_mtd["date"], errors="coerce")
+    df_mtd = df_mtd.set_index("date").sort_index()
+    if df_mtd.empty:
+        raise ValueError("No combined daily data for the window.")
+
+    # Only the window's last day is reported, so take the full-history running peak up to
+    # that date as one fmax reduction instead of materializing peak and drawdown columns
+    last = df_mtd.index[-1]
+    peak = np.fmax.reduce(df_all.loc[:last, "end_balance_combined"].to_numpy(dtype="float64"))
+    current_dd = (df_mtd["end_balance_combined"].iloc[-1] - peak) / peak
 
     return current_dd, max_dd_all
@@ -3,38 +3,31 @@
 
 from __future__ import annotations
 
-import pandas as pd
+import numpy as np
 from pandas import DataFrame
 
+from .returns import latest_month
+
 
 def current_drawdown(live_value: float, peak_value: float) -> float:
     """Current drawdown = (live - peak) / peak."""
     return (live_value - peak_value) / peak_value if peak_value != 0.0 else 0.0
 
 
-def mtd_drawdown_from_returns(r: DataFrame) -> dict[str, float]:
-    """Compute MTD max drawdown from a returns series.
+def drawdown_from_levels(levels: np.ndarray) -> np.ndarray:
+    """(level - running peak) / peak down axis 0, straight from balances.
 
-    The input is a DataFrame of percentage returns (not levels). The function
-    extracts the latest month per column, converts returns to a normalized
-    equity curve via cumulative product, and then computes the minimum
-    drawdown over that month.
+    Same values as cumprod'ing pct returns first: the return curve is the balance
+    curve rescaled, and the ratio to the running peak does not see the scale. Rows
+    whose peak is 0 (or not yet defined) are NaN.
     """
-    if r.empty:
-        return {}
-    idx = pd.DatetimeIndex(r.index)
-    ym = idx.year * 100 + idx.month
-    latest = int(ym.max())
-    month = r.loc[ym == latest]
-    if month.empty:
-        return {}
-    out: dict[str, float] = {}
-    for col in month.columns:
-        eq = (1.0 + month[col]).cumprod()
-        peak = eq.cummax()
-        dd = (eq - peak) / peak
-        out[str(col)] = float(dd.min()) if not dd.empty else 0.0
-    return out
+    peak = np.fmax.accumulate(levels, axis=0)
+    undefined = ~(peak != 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.divide(levels, peak, out=peak)
+    dd -= 1.0
+    dd[undefined] = np.nan
+    return dd
 
 
 def mtd_max_dd_from_levels(levels: DataFrame) -> dict[str, float]:
@@ -44,21 +37,23 @@ def mtd_max_dd_from_levels(levels: DataFrame) -> dict[str, float]:
     returns. For each column, we isolate the latest month, take the cumulative
     max, and measure the minimum (level - peak) / peak over that window.
     """
-    if levels.empty:
-        return {}
-    idx = pd.DatetimeIndex(levels.index)
-    ym = idx.year * 100 + idx.month
-    latest = int(ym.max())
-    month = levels.loc[ym == latest]
+    month = latest_month(levels)
     if month.empty:
         return {}
-    out: dict[str, float] = {}
-    for col in month.columns:
-        s = pd.to_numeric(month[col], errors="coerce").dropna()
-        if s.empty:
-            out[str(col)] = 0.0
-            continue
-        peak = s.cummax()
-        dd = (s - peak) / peak
-        out[str(col)] = float(dd.min())
-    return out
+    vals = month.to_numpy(dtype="float64", na_value=np.nan)
+    mdd = _max_dd_by_column(vals)
+    mdd[np.isnan(vals).all(axis=0)] = 0.0  # no usable levels in the window
+    return dict(zip(map(str, month.columns), mdd.tolist(), strict=True))
+
+
+def _max_dd_by_column(levels: np.ndarray) -> np.ndarray:
+    """Minimum (level - running peak) / peak down each column of a 2-D array.
+
+    NaN levels are skipped (fmax/fmin ignore them), matching pandas' skipna cummax/min.
+    Computed as level / peak - 1 inside the peak buffer, so one temporary is allocated.
+    """
+    dd = np.fmax.accumulate(levels, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(levels, dd, out=dd)
+    dd -= 1.0
+    return np.fmin.reduce(dd, axis=0)
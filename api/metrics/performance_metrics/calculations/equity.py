@@ -3,21 +3,42 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
+import numpy as np
+import orjson
 import pandas as pd
 from pandas import DataFrame, Series
 
-from ....db.sql import read_earnings, read_trades, read_transactions
+from ....core.config import LEDGER_CACHE_TTL
+from ....db.redis import cache_get_many, cache_set_many
+from ....db.sql import (
+    TradeColumns,
+    read_earnings,
+    read_trades,
+    read_transactions,
+    trade_columns,
+)
+from ....utils.concurrency import map_accounts
+
+
+def is_funding_fee(income_type: Series) -> np.ndarray:
+    """Boolean mask of rows whose incomeType is FUNDING_FEE, in any letter case."""
+    cat = income_type.astype("category")
+    hits = cat.cat.categories.astype(str).str.upper() == "FUNDING_FEE"
+    # Missing labels have code -1, which picks the trailing False
+    return np.append(hits, False)[cat.cat.codes.to_numpy()]
 
 
-def _daily_pnl(trades: DataFrame, txn: DataFrame, earn: DataFrame) -> Series:
-    """Sum daily PnL from trades (net), funding fee, earnings. Excludes transfers."""
+def event_pnl(trades: DataFrame, txn: DataFrame, earn: DataFrame) -> Series:
+    """Event-level PnL from trades (net), funding fee, earnings. Excludes transfers."""
     parts: list[Series] = []
     if not trades.empty:
         parts.append(trades["realizedPnl"])
     if not txn.empty:
-        it = txn["incomeType"].astype(str).str.upper()
-        if it.eq("FUNDING_FEE").any():
-            parts.append(txn.loc[it.eq("FUNDING_FEE"), "income"])
+        funding = is_funding_fee(txn["incomeType"])
+        if funding.any():
+            parts.append(txn.loc[funding, "income"])
         # Exclude TRANSFER by design
     if not earn.empty:
         parts.append(earn["rewards"])
@@ -25,49 +46,170 @@ def _daily_pnl(trades: DataFrame, txn: DataFrame, earn: DataFrame) -> Series:
         return pd.Series(dtype="float64")
     s = pd.concat(parts).sort_index()
     s.index = pd.DatetimeIndex(s.index)
-    return s.resample("D").sum()
+    return s
+
+
+_DAY_NS = 86_400_000_000_000
+
+
+def bucket_by_day(ts_ns: np.ndarray, vals: np.ndarray, start_ns: int, ndays: int) -> np.ndarray:
+    """Sum `vals` into `ndays` day buckets counted from `start_ns` (int64 epoch-ns stamps).
+
+    A single integer-day `np.bincount`; stamps outside the window are dropped and NaN
+    values count as 0.0.
+    """
+    if ts_ns.size == 0 or ndays == 0:
+        return np.zeros(ndays, dtype="float64")
+    day = (ts_ns - start_ns) // _DAY_NS
+    weights = np.nan_to_num(vals.astype("float64", copy=False), nan=0.0)
+    keep = (day >= 0) & (day < ndays)
+    return np.bincount(day[keep], weights=weights[keep], minlength=ndays)
+
+
+def daily_bucket_block(
+    events: Mapping[str, Series], accounts: list[str], idx: pd.DatetimeIndex
+) -> np.ndarray:
+    """Sum each account's event PnL into the calendar days of `idx` (daily, midnight-aligned).
+
+    Returns a Fortran-ordered (days x accounts) block; column j equals
+    `events[accounts[j]].resample("D").sum().reindex(idx, fill_value=0.0)`.
+    """
+    ndays, ncols = len(idx), len(accounts)
+    cells: list[np.ndarray] = []
+    weights: list[np.ndarray] = []
+    for j, acc in enumerate(accounts):
+        ev = events[acc]
+        if ev.empty or ndays == 0:
+            continue
+        day = (pd.DatetimeIndex(ev.index).as_unit("ns").asi8 - idx[0].value) // _DAY_NS
+        keep = (day >= 0) & (day < ndays)
+        cells.append(day[keep] + j * ndays)
+        weights.append(ev.to_numpy(dtype="float64")[keep])
+    if not cells:
+        return np.zeros((ndays, ncols), dtype="float64", order="F")
+    w = np.nan_to_num(np.concatenate(weights), nan=0.0)
+    flat = np.bincount(np.concatenate(cells), weights=w, minlength=ndays * ncols)
+    # Cells are account-major, so the transposed view is column-contiguous
+    return flat.astype("float64", copy=False).reshape(ncols, ndays).T
+
+
+def _encode_ledger(events: Series, trades: TradeColumns) -> bytes:
+    """Pack one account's event PnL and trade columns as JSON arrays."""
+    return orjson.dumps(
+        {
+            "ev_ts": pd.DatetimeIndex(events.index).as_unit("ns").asi8,
+            "ev": events.to_numpy(dtype="float64"),
+            "ts": trades.ts_ns,
+            "pnl": trades.pnl,
+            "sym": trades.symbol.tolist(),
+        },
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def _decode_ledger(raw: bytes | str) -> tuple[Series, TradeColumns]:
+    """Inverse of `_encode_ledger`."""
+    d = orjson.loads(raw)
+    ev_idx = pd.DatetimeIndex(np.asarray(d["ev_ts"], dtype="int64").view("datetime64[ns]"))
+    events = pd.Series(np.asarray(d["ev"], dtype="float64"), index=ev_idx, dtype="float64")
+    trades = TradeColumns(
+        ts_ns=np.asarray(d["ts"], dtype="int64"),
+        pnl=np.asarray(d["pnl"], dtype="float64"),
+        symbol=np.asarray(d["sym"], dtype=object),
+    )
+    return events, trades
 
 
-def _coerce_float(x: object) -> float:
-    """Robust scalar→float conversion to satisfy pandas-stubs/pylance."""
-    if isinstance(x, int | float):
-        return float(x)
-    try:
-        ser = pd.Series([x])
-        val = pd.to_numeric(ser, errors="coerce").iloc[0]
-        return float(val) if pd.notna(val) else 0.0
-    except Exception:
-        return 0.0
+def read_ledgers(
+    accounts: list[str],
+    start_day: pd.Timestamp,
+    end_day: pd.Timestamp,
+) -> tuple[dict[str, Series], dict[str, TradeColumns]]:
+    """Read trades/transactions/earnings once per account.
+
+    Returns ({acc: event PnL}, {acc: trade columns}). The window spans start_day
+    00:00:00 through end_day 23:59:59, so callers with a narrower window (regular
+    returns, losing days, symbol PnL) slice instead of re-querying.
+
+    Each account's result is kept in Redis for LEDGER_CACHE_TTL seconds, so repeated
+    polls of the same window skip MySQL. Cache lookups and writes are one round trip
+    each for all accounts.
+    """
+    start_dt = f"{start_day.date()} 00:00:00"
+    end_dt = f"{end_day.date()} 23:59:59"
+    keys = {a: f"ledger:{a}:{start_dt}:{end_dt}" for a in accounts}
+
+    ledgers: dict[str, tuple[Series, TradeColumns]] = {}
+    if LEDGER_CACHE_TTL > 0:
+        for acc, raw in zip(keys, cache_get_many(list(keys.values())), strict=True):
+            if raw is None:
+                continue
+            try:
+                ledgers[acc] = _decode_ledger(raw)
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                # Truncated or stale-schema blob: read the account from MySQL instead
+                continue
+
+    # Each account's three tables are separate pool jobs, so they overlap too
+    readers = (read_trades, read_transactions, read_earnings)
+    missing = [a for a in keys if a not in ledgers]
+    frames = map_accounts(
+        lambda job: readers[job[1]](job[0], start_dt, end_dt),
+        [(a, k) for a in missing for k in range(len(readers))],
+    )
+    fresh: dict[str, tuple[Series, TradeColumns]] = {}
+    for acc in missing:
+        tr, tx, er = (frames[(acc, k)] for k in range(len(readers)))
+        fresh[acc] = (event_pnl(tr, tx, er), trade_columns(tr))
+    if LEDGER_CACHE_TTL > 0:
+        cache_set_many(
+            {keys[a]: _encode_ledger(ev, tc) for a, (ev, tc) in fresh.items()}, LEDGER_CACHE_TTL
+        )
+    ledgers.update(fresh)
+    ledgers = {a: ledgers[a] for a in keys}
+    events = {a: ev for a, (ev, _) in ledgers.items()}
+    trades = {a: tc for a, (_, tc) in ledgers.items()}
+    return events, trades
+
+
+def read_event_pnl(
+    accounts: list[str],
+    start_day: pd.Timestamp,
+    end_day: pd.Timestamp,
+) -> dict[str, Series]:
+    """Return {acc: event PnL} over start_day 00:00:00 .. end_day 23:59:59."""
+    events, _ = read_ledgers(accounts, start_day, end_day)
+    return events
 
 
 def build_fixed_balances(
     accounts: list[str],
     start_day: pd.Timestamp,
     end_day: pd.Timestamp,
+    events: Mapping[str, Series] | None = None,
+    initial: Mapping[str, float] | None = None,
 ) -> tuple[DataFrame, dict[str, float]]:
-    """Build realized equity series (no UPnL, no unrealized shift), daily frequency."""
+    """Build realized equity series (no UPnL, no unrealized shift), daily frequency.
+
+    Pass `events` from `read_ledgers` to reuse already-fetched ledgers. With `initial`,
+    each column is seeded with the account's opening balance (levels); without it the
+    result is cumulative deltas from 0.
+    """
     idx = pd.date_range(start_day.normalize(), end_day.normalize(), freq="D")
-    cols: list[Series] = []
     init_map: dict[str, float] = {}
 
     # Initial balance is fetched by orchestrator; here we only build deltas.
-    for acc in accounts:
-        tr = read_trades(acc, f"{start_day.date()} 00:00:00", f"{end_day.date()} 23:59:59")
-        tx = read_transactions(acc, f"{start_day.date()} 00:00:00", f"{end_day.date()} 23:59:59")
-        er = read_earnings(acc, f"{start_day.date()} 00:00:00", f"{end_day.date()} 23:59:59")
-
-        daily = _daily_pnl(tr, tx, er)
-        if daily.empty:
-            s = pd.Series(0.0, index=idx, name=acc, dtype="float64")
-        else:
-            s = daily.reindex(idx).fillna(0.0).cumsum()
-        cols.append(s.rename(acc))
-
-    delta = (
-        pd.concat(cols, axis=1)
-        if cols
-        else pd.DataFrame(index=idx, columns=accounts, dtype="float64")
-    )
+    if events is None:
+        events = read_event_pnl(accounts, start_day, end_day)
+
+    # One (days x accounts) block for every account, cumulated in place.
+    # Column-major so every downstream per-column op (cumsum, cummax, ffill) is contiguous.
+    arr = daily_bucket_block(events, list(accounts), idx)
+    np.cumsum(arr, axis=0, out=arr)
+    if initial is not None:
+        arr += np.array([float(initial.get(a, 0.0)) for a in accounts], dtype="float64")
+
+    delta = pd.DataFrame(arr, index=idx, columns=list(accounts))
     return delta, init_map  # init_map kept for signature parity
 
 
@@ -80,11 +222,11 @@ def build_margin_series(
     """Margin = realized + unrealizedJson (constant), then inject UPnL on last row only."""
     if fixed_balances.empty:
         return fixed_balances
+    shift = np.array([float(unrealized_map.get(a, 0.0)) for a in accounts], dtype="float64")
+    bump = np.array([float(upnl_map.get(a, 0.0)) for a in accounts], dtype="float64")
+    # Shift and bump on the raw block; a NaN last-row level stays NaN
+    vals = fixed_balances[accounts].to_numpy(dtype="float64", copy=True) + shift
+    vals[-1] += bump
     out = fixed_balances.copy()
-    for a in accounts:
-        out[a] = out[a] + float(unrealized_map.get(a, 0.0))
-    last = out.index[-1]
-    for a in accounts:
-        base_val = _coerce_float(out.at[last, a])
-        out.at[last, a] = base_val + float(upnl_map.get(a, 0.0))
+    out[accounts] = vals
     return out
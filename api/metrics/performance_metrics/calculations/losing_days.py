@@ -13,71 +13,61 @@ Rules:
 
 from __future__ import annotations
 
+import logging
+from collections.abc import Mapping
+
+import numpy as np
 import pandas as pd
 
-from ....db.sql import read_trades
+from ....db.sql import TradeColumns
+from .equity import bucket_by_day
+
+logger = logging.getLogger(__name__)
+
+_HOUR_NS = 3_600_000_000_000
 
 
 def _daily_trades_net(
-    df: pd.DataFrame,
-    start_day: pd.Timestamp,
-    end_day: pd.Timestamp,
+    trades: TradeColumns,
+    full_idx: pd.DatetimeIndex,
     day_start_hour: int,
-) -> pd.Series:
-    """Trades-only daily net PnL with a local-day boundary shift (day_start_hour)."""
-    full_idx = pd.date_range(start_day.normalize(), end_day.normalize(), freq="D")
-
-    if df.empty:
-        return pd.Series(0.0, index=full_idx, dtype="float64")
+) -> np.ndarray:
+    """Trades-only daily net PnL with a local-day boundary shift (day_start_hour).
 
-    # Ensure types
-    s = pd.to_numeric(df["realizedPnl"], errors="coerce").fillna(0.0).astype("float64")
-    idx = pd.DatetimeIndex(df.index)
+    `full_idx` is the caller's day-label range, built once and shared across accounts;
+    the result is aligned to it position by position.
+    """
+    if trades.empty:
+        return np.zeros(len(full_idx), dtype="float64")
 
     # Shift timestamps backward by the local day-start hour, then sum into days
-    shifted_idx = idx - pd.Timedelta(hours=day_start_hour)
-    shifted = pd.Series(s.values, index=shifted_idx, dtype="float64")
-
-    daily = shifted.resample("D").sum()
-    return daily.reindex(full_idx, fill_value=0.0).astype("float64")
-
-
-def _streak_from_series(daily: pd.Series, *, eps: float = 1e-9) -> tuple[int, pd.Series]:
-    """Count consecutive strictly-negative days from the end, skipping trailing zeros."""
-    if daily.empty:
-        return 0, daily.iloc[0:0]
+    shifted = trades.ts_ns - day_start_hour * _HOUR_NS
+    return bucket_by_day(shifted, trades.pnl, full_idx[0].value, len(full_idx))
 
-    vals = [float(v) for v in daily.tolist()]
 
-    # Skip trailing ~0.0
-    i = len(vals) - 1
-    while i >= 0 and abs(vals[i]) <= eps:
-        i -= 1
-    if i < 0:
-        return 0, daily.iloc[0:0]
+def _losing_streaks(daily: np.ndarray, *, eps: float = 1e-9) -> tuple[np.ndarray, np.ndarray]:
+    """Count consecutive strictly-negative days from the end of each row, skipping trailing zeros.
 
-    # Count consecutive losses
-    start = i
-    streak = 0
-    while i >= 0 and (vals[i] < -eps):
-        streak += 1
-        i -= 1
-
-    if streak == 0:
-        return 0, daily.iloc[0:0]
+    `daily` is (series x days). Returns (streak, end) per row, where the streak covers
+    days `end - streak + 1 .. end`; rows with no non-zero day get a streak of 0.
+    """
+    n_rows, n_days = daily.shape
+    if n_days == 0:
+        zeros = np.zeros(n_rows, dtype=np.intp)
+        return zeros, zeros
 
-    tail = daily.iloc[start - streak + 1 : start + 1]
-    return streak, tail
+    # Anchor each row at its last non-zero day
+    nonzero = np.abs(daily) > eps
+    end = n_days - 1 - np.argmax(nonzero[:, ::-1], axis=1)
 
+    # Run length of the negative run ending at each day: day minus the last non-loss day
+    day = np.arange(n_days)
+    neg = daily < -eps
+    last_break = np.maximum.accumulate(np.where(neg, -1, day), axis=1)
+    runs = day - last_break
 
-def _series_to_day_map(s: pd.Series) -> dict[str, float]:
-    """Convert a DatetimeIndex series to {YYYY-mm-dd: float} with explicit typing."""
-    if s.empty:
-        return {}
-    idx = pd.DatetimeIndex(s.index)
-    keys = [dt.strftime("%Y-%m-%d") for dt in idx.to_pydatetime()]
-    vals = [float(v) for v in s.to_numpy(dtype="float64", copy=False)]
-    return dict(zip(keys, vals, strict=False))
+    streak = np.where(nonzero.any(axis=1), runs[np.arange(n_rows), end], 0)
+    return streak, end
 
 
 def _last_complete_label(now: pd.Timestamp, day_start_hour: int) -> pd.Timestamp | None:
@@ -91,7 +81,7 @@ def _last_complete_label(now: pd.Timestamp, day_start_hour: int) -> pd.Timestamp
     """
     today = now.normalize()
     today_cut = today + pd.Timedelta(hours=day_start_hour)
-    print(f"today_cut = {today_cut}")
+    logger.debug("losing days today_cut=%s", today_cut)
 
     if now >= today_cut:
         return today - pd.Timedelta(days=1)
@@ -100,9 +90,13 @@ def _last_complete_label(now: pd.Timestamp, day_start_hour: int) -> pd.Timestamp
 
 
 def losing_days_mtd(
-    accounts: list[str], day_start_hour: int, start_day: pd.Timestamp, today: pd.Timestamp
+    accounts: list[str],
+    day_start_hour: int,
+    start_day: pd.Timestamp,
+    today: pd.Timestamp,
+    trades: Mapping[str, TradeColumns],
 ) -> dict[str, object]:
-    """Compute per-account and combined losing streaks for MTD, using complete cut-over days only."""
+    """Compute per-account and combined MTD losing streaks from `trades`, complete days only."""
     last_complete = _last_complete_label(today, day_start_hour)
 
     # Align both to day labels (00:00) so 2025-10-31 08:00 and 2025-10-31 00:00 compare equal
@@ -114,28 +108,29 @@ def losing_days_mtd(
 
     # Build the allowed label range [idx_start .. idx_end]
     full_idx = pd.date_range(idx_start, idx_end, freq="D")
+    read_start = f"{idx_start.date()} 00:00:00"
+    read_end = today.strftime("%Y-%m-%d %H:%M:%S")
+
+    # One row per account plus the combined row; streaks are then found for all rows at once
+    daily_mat = np.zeros((len(accounts) + 1, len(full_idx)), dtype="float64")
+
+    for i, a in enumerate(accounts):
+        acc_trades = trades[a].between(read_start, read_end)
+        daily_mat[i] = _daily_trades_net(acc_trades, full_idx, day_start_hour)
+
+    daily_mat[-1] = daily_mat[:-1].sum(axis=0)
+    streaks, ends = _losing_streaks(daily_mat, eps=1e-9)
+
+    # Day labels are formatted once and shared by every account's tail
+    day_keys = full_idx.strftime("%Y-%m-%d").tolist()
+
+    def _block(row: int) -> dict[str, object]:
+        streak, end = int(streaks[row]), int(ends[row])
+        if not streak:
+            return {"consecutive": 0, "days": {}}
+        lo, hi = end - streak + 1, end + 1
+        days = dict(zip(day_keys[lo:hi], daily_mat[row, lo:hi].tolist(), strict=True))
+        return {"consecutive": streak, "days": days}
 
-    combined_daily = pd.Series(0.0, index=full_idx, dtype="float64")
-    per: dict[str, dict[str, object]] = {}
-
-    for a in accounts:
-        df = read_trades(
-            a,
-            f"{idx_start.date()} 00:00:00",
-            today.strftime("%Y-%m-%d %H:%M:%S"),
-        )
-        daily = _daily_trades_net(df, idx_start, idx_end, day_start_hour)
-        streak, tail = _streak_from_series(daily, eps=1e-9)
-
-        per[a] = {
-            "consecutive": int(streak),
-            "days": _series_to_day_map(tail) if streak else {},
-        }
-        combined_daily = combined_daily.add(daily, fill_value=0.0)
-
-    c_streak, c_tail = _streak_from_series(combined_daily, eps=1e-9)
-    combined = {
-        "consecutive": int(c_streak),
-        "days": _series_to_day_map(c_tail) if c_streak else {},
-    }
-    return {"perAccount": per, "combined": combined}
+    per = {a: _block(i) for i, a in enumerate(accounts)}
+    return {"perAccount": per, "combined": _block(len(accounts))}
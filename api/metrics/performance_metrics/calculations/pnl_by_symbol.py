@@ -3,40 +3,47 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import cast
+
+import numpy as np
 import pandas as pd
 
-from ....db.sql import read_trades
+from ....db.sql import TradeColumns
 
 
 def pnl_by_symbol_mtd(
     accounts: list[str],
     start_day_iso: str,
     end_day_iso: str,
+    trades: Mapping[str, TradeColumns],
 ) -> tuple[dict[str, dict[str, float]], dict[str, float]]:
-    """Aggregate realized PnL per symbol across accounts."""
-    frames: list[pd.Series] = []
+    """Aggregate realized PnL per symbol across accounts from their `trades` columns."""
+    cols: dict[str, tuple[np.ndarray, np.ndarray]] = {}
     for a in accounts:
-        df = read_trades(a, start_day_iso, end_day_iso)
-        if df.empty:
-            continue
-        use = df.loc[:, ["symbol", "realizedPnl"]].copy()
-        use["symbol"] = use["symbol"].astype("string")
-        use["realizedPnl"] = pd.to_numeric(use["realizedPnl"], errors="coerce").fillna(0.0)
-        grp = use.groupby("symbol", sort=False)["realizedPnl"].sum()
-        frames.append(grp.rename(a))
-
-    if not frames:
+        acc_trades = trades[a].between(start_day_iso, end_day_iso)
+        if acc_trades.pnl.size:
+            cols[a] = (acc_trades.symbol, acc_trades.pnl)
+
+    if not cols:
         return {}, {a: 0.0 for a in accounts}
 
-    table = pd.concat(frames, axis=1).fillna(0.0).astype("float64")
+    # One (symbol x account) bincount over the concatenated fills.
+    # Symbols are factorized by hashing; only the distinct names get sorted.
+    traded = list(cols)
+    symbol = np.concatenate([cols[a][0] for a in traded])
+    pnl = np.concatenate([cols[a][1] for a in traded])
+    acc_id = np.repeat(np.arange(len(traded)), [cols[a][1].size for a in traded])
+    keep = symbol != ""
+    sym_id, names = pd.factorize(symbol[keep], sort=True)
+    cell = sym_id * len(traded) + acc_id[keep]
+    grid = np.bincount(cell, weights=pnl[keep], minlength=names.size * len(traded))
+    grid = grid.astype("float64", copy=False).reshape(names.size, len(traded))
+
+    table = pd.DataFrame(grid, index=pd.Index(names, name="symbol"), columns=traded)
     table["TOTAL"] = table.sum(axis=1)
     table.sort_values("TOTAL", ascending=False, inplace=True)
 
-    symbols: dict[str, dict[str, float]] = {}
-    for idx, row in table.iterrows():
-        symbols[str(idx)] = {str(k): float(v) for k, v in row.items()}
-
-    totals: dict[str, float] = {
-        str(c): float(table[c].sum()) for c in table.columns if str(c) != "TOTAL"
-    }
+    symbols = cast(dict[str, dict[str, float]], table.to_dict(orient="index"))
+    totals = cast(dict[str, float], table.drop(columns="TOTAL").sum().to_dict())
     return symbols, totals
@@ -5,10 +5,46 @@ from collections.abc import Iterable
 
 import pandas as pd
 
-from ....db.redis_v2 import wallet_balance
+from ....db.redis import read_upnl
 
 # helpers
 from ....db.sql_v2 import get_data
+from ....utils.concurrency import map_accounts
+from .drawdown import drawdown_from_levels
+from .equity import is_funding_fee
+
+_TABLES = (
+    ("balance", "balance"),
+    ("trades", "trades"),
+    ("transaction", "transaction_history"),
+    ("earnings", "earnings"),
+)
+
+
+def _load_tables(
+    accs: list[str],
+) -> dict[str, tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]]:
+    # every (account, table) read is its own pool job, so one account's four tables overlap
+    frames = map_accounts(
+        lambda job: get_data(job[0], *_TABLES[job[1]]),
+        [(acc, k) for acc in accs for k in range(len(_TABLES))],
+    )
+    return {acc: tuple(frames[(acc, k)] for k in range(len(_TABLES))) for acc in accs}  # type: ignore[misc]
+
+
+def _monthly_stats(balance: pd.Series, drawdown: pd.Series, *, suffix: str = "") -> pd.DataFrame:
+    """Per-month return (last / first balance - 1) and worst daily drawdown."""
+    grouped = pd.DataFrame({"balance": balance, "drawdown": drawdown}).resample("ME")
+    first = grouped["balance"].first().to_numpy(dtype="float64")
+    last = grouped["balance"].last()
+    worst = grouped["drawdown"].min().to_numpy(dtype="float64")
+    return pd.DataFrame(
+        {
+            f"monthly_return{suffix}": last.to_numpy(dtype="float64") / first - 1.0,
+            f"monthly_drawdown{suffix}": worst,
+            "month": last.index.to_period("M").astype(str),
+        }
+    )
 
 
 def process_df(
@@ -23,12 +59,15 @@ def process_df(
     start_ts = pd.to_datetime(start_date)
     end_ts = pd.to_datetime(end_date)
 
+    # Same `{acc}_live` MGET as the MTD blocks: within its 2s cache the payload's two
+    # process_df calls and the uPnL block share one Redis round trip and parse
+    upnl_map = read_upnl(acc_list)
+    # the four table reads per account are network-bound; fetch them all concurrently
+    tables = _load_tables(acc_list)
+
     for acc in acc_list:
         # --- load & normalize ---
-        balance = get_data(acc, "balance", "balance").copy()
-        trades = get_data(acc, "trades", "trades").copy()
-        trnsc_history = get_data(acc, "transaction", "transaction_history").copy()
-        earnings = get_data(acc, "earnings", "earnings").copy()
+        balance, trades, trnsc_history, earnings = tables[acc]
 
         balance["datetime"] = pd.to_datetime(balance["datetime"], errors="coerce")
         trades["time"] = pd.to_datetime(trades["time"], errors="coerce")
@@ -66,9 +105,7 @@ def process_df(
         trades_df = trades_f[["time", "dollar_val", "transaction_type"]]
 
         # funding fees from transactions
-        trnsc_funding = trnsc_f.loc[
-            trnsc_f["incomeType"].astype(str).str.upper() == "FUNDING_FEE"
-        ].copy()
+        trnsc_funding = trnsc_f.loc[is_funding_fee(trnsc_f["incomeType"])].copy()
         trnsc_funding["dollar_val"] = trnsc_funding["income"].astype(float)
         trnsc_funding["transaction_type"] = "funding_fee"
         funding_df = trnsc_funding[["time", "dollar_val", "transaction_type"]]
@@ -114,14 +151,15 @@ def process_df(
         daily_balances.index.name = "date"
 
         # inject UPnL into most recent day
-        upnl: float = float(wallet_balance(acc))
+        upnl: float = float(upnl_map[acc])
         if not daily_balances.empty:
             daily_balances.iloc[-1] = float(daily_balances.iloc[-1]) + upnl
 
         daily_returns = daily_balances.pct_change().fillna(0.0)
-        peaks = daily_balances.cummax()
-        peaks = peaks.replace(0.0, pd.NA)  # avoid div-by-zero
-        daily_drawdowns = (daily_balances - peaks) / peaks
+        daily_drawdowns = pd.Series(
+            drawdown_from_levels(daily_balances.to_numpy(dtype="float64")),
+            index=daily_balances.index,
+        )
 
         daily_report = pd.DataFrame(
             {
@@ -132,21 +170,7 @@ def process_df(
             index=daily_balances.index,
         ).reset_index(names="date")
 
-        # --- Monthly stats via resample (sidestep strftime typing) ---
-        dr_idx = daily_report.set_index("date")
-        monthly = dr_idx.resample("M")
-        monthly_stats = monthly.apply(
-            lambda dfm: pd.Series(
-                {
-                    "monthly_return": float(
-                        dfm["end_balance"].iloc[-1] / dfm["end_balance"].iloc[0] - 1.0
-                    ),
-                    "monthly_drawdown": float(dfm["daily_drawdown"].min()),
-                }
-            )
-        ).reset_index()
-        monthly_stats["month"] = monthly_stats["date"].dt.to_period("M").astype(str)
-        monthly_report = monthly_stats.drop(columns=["date"])
+        monthly_report = _monthly_stats(daily_balances, daily_drawdowns)
 
         results[acc] = {"daily": daily_report, "monthly": monthly_report}
 
@@ -167,27 +191,16 @@ def process_df(
             combined["daily_return_combined"] = (
                 combined["end_balance_combined"].pct_change().fillna(0.0)
             )
-            c_peaks = combined["end_balance_combined"].cummax().replace(0.0, pd.NA)
-            combined["daily_drawdown_combined"] = (
-                combined["end_balance_combined"] - c_peaks
-            ) / c_peaks
+            combined["daily_drawdown_combined"] = drawdown_from_levels(
+                combined["end_balance_combined"].to_numpy(dtype="float64")
+            )
 
             combined_daily = combined.reset_index().rename(columns={"index": "date"})
 
-            monthly_c = combined.resample("M")
-            monthly_combined = monthly_c.apply(
-                lambda dfm: pd.Series(
-                    {
-                        "monthly_return_combined": float(
-                            dfm["end_balance_combined"].iloc[-1]
-                            / dfm["end_balance_combined"].iloc[0]
-                            - 1.0
-                        ),
-                        "monthly_drawdown_combined": float(dfm["daily_drawdown_combined"].min()),
-                    }
-                )
-            ).reset_index()
-            monthly_combined["month"] = monthly_combined["date"].dt.to_period("M").astype(str)
-            combined_monthly = monthly_combined.drop(columns=["date"])
+            combined_monthly = _monthly_stats(
+                combined["end_balance_combined"],
+                combined["daily_drawdown_combined"],
+                suffix="_combined",
+            )
 
     return results, combined_daily, combined_monthly
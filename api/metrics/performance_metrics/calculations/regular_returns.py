@@ -1,43 +1,40 @@
 # api/metrics/performance_metrics/calculations/regular_returns.py
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
+from typing import cast
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame, Series
 
 from ....db.sql import read_earnings, read_trades, read_transactions
+from ....utils.concurrency import map_accounts
+from .equity import _DAY_NS, bucket_by_day, event_pnl
 
 
-def _sessionize_sum(
-    s: Series,
+def _session_wall_ns(
+    index: pd.Index,
     *,
     day_start_hour: int = 8,
     tz: str = "Asia/Manila",
-) -> Series:
-    """Sum a timestamp-indexed Series into 'trading days' that start at `day_start_hour` local.
+) -> np.ndarray:
+    """Return epoch-ns wall-clock stamps shifted so that flooring to a day gives the session.
 
     Mapping (Asia/Manila):
       08:00 .. next-day 07:59  -> labeled by the start date (e.g., 2025-10-19).
       <= 07:59 of a calendar day -> rolls back to previous trading day.
     """
-    if s.empty:
-        return s
-
-    # Ensure DatetimeIndex
-    s = s.copy()
-    idx = pd.DatetimeIndex(s.index)
+    idx = pd.DatetimeIndex(index)
     # Localize/convert preserving wall time semantics used elsewhere in CODE B
     if idx.tz is None:
         idx = idx.tz_localize(ZoneInfo(tz))
     else:
         idx = idx.tz_convert(ZoneInfo(tz))
-
-    # Shift left by the session start, then floor to day to get the session label
-    session_dates = (idx - pd.Timedelta(hours=day_start_hour)).floor("D").date
-    s.index = pd.Index(session_dates, name="session_date")
-    return s.groupby(level=0).sum()  # index is dtype 'object' of date; fine for serialization
+    # Shift left by the session start on the absolute clock, then read back local wall time
+    shifted = (idx - pd.Timedelta(hours=day_start_hour)).tz_localize(None)
+    return shifted.as_unit("ns").asi8
 
 
 def _parts_pnl(
@@ -46,30 +43,14 @@ def _parts_pnl(
     end_day: pd.Timestamp,
 ) -> Series:
     """Build the raw event-level PnL series (trades net of fees, funding fees, earnings).
-    This mirrors equity._daily_pnl's inputs, but without daily resampling; we keep
+    Same construction as equity.event_pnl, but over this module's window; we keep
     the event timestamps to sessionize afterwards.
     """
     tr = read_trades(account, f"{start_day.date()} 00:00:00", f"{end_day.date()} 00:00:00")
     tx = read_transactions(account, f"{start_day.date()} 00:00:00", f"{end_day.date()} 00:00:00")
     er = read_earnings(account, f"{start_day.date()} 00:00:00", f"{end_day.date()} 00:00:00")
 
-    parts: list[Series] = []
-    if not tr.empty:
-        parts.append(tr["realizedPnl"])  # already net of commission in read_trades
-    if not tx.empty:
-        it = tx["incomeType"].astype(str).str.upper()
-        if it.eq("FUNDING_FEE").any():
-            parts.append(tx.loc[it.eq("FUNDING_FEE"), "income"])
-        # TRANSFER intentionally excluded
-    if not er.empty:
-        parts.append(er["rewards"])
-
-    if not parts:
-        return pd.Series(dtype="float64")
-
-    s = pd.concat(parts).sort_index()
-    s.index = pd.DatetimeIndex(s.index)
-    return s
+    return event_pnl(tr, tx, er)
 
 
 def regular_returns_by_session(
@@ -79,20 +60,51 @@ def regular_returns_by_session(
     *,
     day_start_hour: int = 8,
     tz: str = "Europe/Zurich",
+    events: Mapping[str, Series] | None = None,
 ) -> DataFrame:
     """Return a DataFrame indexed by session_date with columns per account, where each cell
     is the sum of dollar PnL within the 08:00→07:59 local window (CODE A's 'regular_returns').
+
+    `events` (from equity.read_ledgers) covers a wider window; it is sliced to
+    end_day 00:00:00 here instead of re-reading SQL.
     """
     accs = [a.strip().lower() for a in accounts if a and a.strip()]
-    frames: list[Series] = []
+    end_cut = pd.Timestamp(f"{end_day.date()} 00:00:00")
+    missing = [a for a in accs if events is None or a not in events]
+    fetched = map_accounts(lambda a: _parts_pnl(a, start_day, end_day), missing)
+    stamps: list[np.ndarray] = []
+    values: list[np.ndarray] = []
     for a in accs:
-        s = _parts_pnl(a, start_day, end_day)
-        sess = _sessionize_sum(s, day_start_hour=day_start_hour, tz=tz)
-        frames.append(sess.rename(a))
-
-    if not frames:
+        if a in fetched:
+            s = fetched[a]
+        else:
+            ev = cast(Mapping[str, Series], events)[a]
+            s = ev if ev.empty else ev.loc[pd.DatetimeIndex(ev.index) <= end_cut]
+        if s.empty:
+            stamps.append(np.empty(0, dtype="int64"))
+            values.append(np.empty(0, dtype="float64"))
+            continue
+        stamps.append(_session_wall_ns(s.index, day_start_hour=day_start_hour, tz=tz))
+        values.append(s.to_numpy(dtype="float64"))
+
+    if not accs:
         return pd.DataFrame()
-
-    df = pd.concat(frames, axis=1).fillna(0.0).sort_index()
-    df.index.name = "session_date"
-    return df
+    present = [ts for ts in stamps if ts.size]
+    if not present:
+        return pd.DataFrame(columns=accs, dtype="float64")
+
+    # One canonical session grid for every account: bucket each once, keep sessions with events
+    first = int(min(ts.min() for ts in present)) // _DAY_NS
+    last = int(max(ts.max() for ts in present)) // _DAY_NS
+    ndays = last - first + 1
+    start_ns = first * _DAY_NS
+
+    sums = np.zeros((ndays, len(accs)), dtype="float64", order="F")
+    seen = np.zeros(ndays, dtype=bool)
+    for j, (ts, vals) in enumerate(zip(stamps, values, strict=True)):
+        sums[:, j] = bucket_by_day(ts, vals, start_ns, ndays)
+        seen |= bucket_by_day(ts, np.ones(ts.size), start_ns, ndays) > 0
+
+    days = pd.to_datetime(np.flatnonzero(seen) * _DAY_NS + start_ns)
+    index = pd.Index(days.date, name="session_date")
+    return pd.DataFrame(sums[seen], index=index, columns=accs)
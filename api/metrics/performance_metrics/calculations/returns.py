@@ -7,31 +7,32 @@ import pandas as pd
 from pandas import DataFrame
 
 
-def pct_returns(balance: DataFrame) -> DataFrame:
-    """Period-over-period returns by column; NaN->0.0."""
-    prev = balance.shift(1)
-    out = (balance - prev) / prev
-    return out.where(~out.isna(), 0.0)
+def latest_month(frame: DataFrame) -> DataFrame:
+    """Rows of `frame` that fall in the latest calendar month of its DatetimeIndex.
+
+    Indexes here are built ascending, so the month is a tail slice located with one
+    binary search; an unsorted index falls back to a year/month mask.
+    """
+    if frame.empty:
+        return frame
+    idx = pd.DatetimeIndex(frame.index)
+    if idx.is_monotonic_increasing and not pd.isna(idx[-1]):
+        month_start = idx[-1].normalize().replace(day=1)
+        return frame.iloc[idx.searchsorted(month_start, side="left") :]
+    ym = idx.year * 100 + idx.month
+    return frame.loc[ym == int(ym.max())]
 
 
 def mtd_return(balance: DataFrame) -> dict[str, float]:
     """Month-to-date simple return per column (latest month in index)."""
-    if balance.empty:
-        return {}
-    idx = pd.DatetimeIndex(balance.index)
-    ym = idx.year * 100 + idx.month
-    latest = int(ym.max())
-    month = balance.loc[ym == latest]
+    month = latest_month(balance)
     if month.empty:
         return {}
-    first = month.iloc[0]
-    last = month.iloc[-1]
-    out: dict[str, float] = {}
-    for col in month.columns:
-        first_val = float(first[col])
-        last_val = float(last[col])
-        out[str(col)] = (last_val - first_val) / first_val if first_val != 0.0 else 0.0
-    return out
+    first = month.iloc[0].astype("float64")
+    last = month.iloc[-1].astype("float64")
+    ret = (last - first) / first
+    ret[first == 0.0] = 0.0
+    return {str(k): float(v) for k, v in ret.items()}
 
 
 def live_return_realized(
@@ -13,22 +13,28 @@ Changes:
 
 from __future__ import annotations
 
-import json
+import logging
+import threading
 from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import TypedDict, cast
 from zoneinfo import ZoneInfo
 
+import numpy as np
+import orjson
 import pandas as pd
+from cachetools import TTLCache
 from pandas import DataFrame
 
 from ...core.config import now_utc_iso
 from ...db.baseline import read_unrealized_json
 from ...db.redis import read_upnl, upnl_payload
-from ...db.sql import nearest_balance_on_or_before
+from ...db.sql import balances_on_or_before
+from ...utils.concurrency import run_in_background
 from .calculations.all_time_dd import current_max_dd
 from .calculations.drawdown import mtd_max_dd_from_levels
-from .calculations.equity import build_fixed_balances, build_margin_series
+from .calculations.equity import build_fixed_balances, build_margin_series, read_ledgers
 from .calculations.losing_days import losing_days_mtd
 from .calculations.pnl_by_symbol import pnl_by_symbol_mtd
 from .calculations.regular_returns import regular_returns_by_session
@@ -38,16 +44,28 @@ from .calculations.returns import (
     mtd_return,
 )
 
+logger = logging.getLogger(__name__)
+
+_MANILA = ZoneInfo("Asia/Manila")
+
+# Month-open balances only move when the MTD window rolls over. Keyed per
+# (account, window) so every account subset and strategy view shares the same entries.
+_DAY_OPEN_CACHE: TTLCache[tuple[str, pd.Timestamp], float] = TTLCache(maxsize=1024, ttl=300)
+_CACHE_LOCK = threading.Lock()
+
+# Whole payloads per (accounts, window), for polls that land within a few seconds. Held
+# as JSON bytes so every caller decodes its own dict and none can mutate a shared one.
+_PAYLOAD_CACHE: TTLCache[object, bytes] = TTLCache(maxsize=128, ttl=5)
+_PAYLOAD_LOCK = threading.Lock()
+
 
 def _mtd_window_today() -> tuple[pd.Timestamp, pd.Timestamp]:
     """Return (start_of_month_local@00:00, today_local@00:00, yesterday_local@00:00).
 
     Europe/Zurich anchored. Returns tz-naive timestamps that preserve local wall times.
     """
-    tz = ZoneInfo("Asia/Manila")
-
     # Keep today's DATE, force TIME to 00:00:00 (tz-aware)
-    now_local = pd.Timestamp.now(tz=tz).replace(microsecond=0)
+    now_local = pd.Timestamp.now(tz=_MANILA).replace(microsecond=0)
 
     # First of this month, TIME 00:00:00 (tz-aware). Date remains the 1st.
     # start_local = now_local.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -64,80 +82,70 @@ def _serialize_series(df: pd.DataFrame, accounts: list[str]) -> dict[str, dict[s
     if df.empty:
         return {}
     cols = [a for a in accounts if a in df.columns]
-    out: dict[str, dict[str, float]] = {}
-    for ts, row in df[cols].sort_index().iterrows():
-        per = {a: float(row[a]) for a in cols}
-        per["total"] = float(sum(per.values()))
-        out[str(ts)] = per
-    return out
+    frame = df[cols].sort_index().astype("float64")
+    frame["total"] = frame.sum(axis=1)
+    frame.index = _index_keys(frame.index)
+    return cast(dict[str, dict[str, float]], frame.to_dict(orient="index"))
 
 
-def _last_index(df: pd.DataFrame) -> pd.Timestamp | None:
-    """Return the last timestamp, or None if the DataFrame is empty."""
-    if df.empty:
-        return None
-    try:
-        return pd.Timestamp(df.index[-1])
-    except Exception:
-        return None
+def _index_keys(index: pd.Index) -> pd.Index:
+    """Return `str(label)` for every label, formatting whole-second naive stamps in one pass."""
+    if isinstance(index, pd.DatetimeIndex) and index.tz is None:
+        ns = index.as_unit("ns").asi8
+        if not (ns % 1_000_000_000).any():
+            return pd.Index(index.strftime("%Y-%m-%d %H:%M:%S"))
+    return pd.Index([str(ts) for ts in index])
 
 
-def _float_scalar(x: object) -> float:
-    """Lenient scalar → float with pandas/numpy compatibility, no bare float(obj)."""
-    if isinstance(x, float | int):
-        return float(x)
-    try:
-        ser = pd.Series([x])
-        num = pd.to_numeric(ser, errors="coerce").iloc[0]
-        return float(num) if pd.notna(num) else 0.0
-    except Exception:
-        return 0.0
+def _last_row_values(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """Return the last row of ``df`` for ``cols`` as float64 (missing/NaN → 0.0)."""
+    if df.empty:
+        return np.zeros(len(cols), dtype="float64")
+    pos = df.columns.get_indexer(cols)
+    row = df.iloc[-1:].to_numpy(dtype="float64", na_value=np.nan)[0]
+    vals = np.where(pos >= 0, row[pos], 0.0)
+    vals[np.isnan(vals)] = 0.0
+    return vals
 
 
-def _sum_row(df: pd.DataFrame, idx: pd.Timestamp | None, cols: list[str]) -> float:
-    """Sum a set of columns at a row index, robust for typing/stubs."""
-    if df.empty or idx is None:
-        return 0.0
-    try:
-        row = df.loc[idx]
-    except Exception:
-        return 0.0
-    if not isinstance(row, pd.Series):
-        return 0.0
-    take = [c for c in cols if c in row.index]
-    if not take:
-        return 0.0
-    ser = pd.to_numeric(row[take], errors="coerce")
-    return float(ser.fillna(0.0).sum())
-
-
-def _offset_fixed_with_initial(
-    fixed_delta: pd.DataFrame,
-    init_map: dict[str, float],
-    accounts: list[str],
-) -> pd.DataFrame:
-    """Turn per-period deltas into realized equity by adding SQL initial balances."""
-    if fixed_delta.empty:
-        return fixed_delta
-    fixed = fixed_delta.copy()
-    for a in accounts:
-        if a in fixed.columns:
-            fixed[a] = fixed[a] + float(init_map.get(a, 0.0))
-    return fixed
+def _day_open_balances(accs: tuple[str, ...], start_day: pd.Timestamp) -> dict[str, float]:
+    """Return {account: SQL balance on or before start_day}, cached per (account, window).
+
+    Only accounts without a cached month-open balance go to SQL, in one batched query.
+    """
+    with _CACHE_LOCK:
+        out = {a: _DAY_OPEN_CACHE.get((a, start_day)) for a in accs}
+    missing = [a for a, bal in out.items() if bal is None]
+    if missing:
+        fresh = balances_on_or_before(missing, start_day)
+        with _CACHE_LOCK:
+            for a, bal in fresh.items():
+                _DAY_OPEN_CACHE[(a, start_day)] = bal
+        out.update(fresh)
+    return cast(dict[str, float], out)
 
 
 def _inject_upnl_last_row(
     levels: DataFrame, up_map: dict[str, float], accounts: list[str]
 ) -> DataFrame:
-    """Return a copy of `levels` where each account's last row is incremented by its UPnL."""
+    """Return a copy of `levels` where each account's last row is incremented by its UPnL.
+
+    A `total` column, if present, is bumped by the same amount so it stays the row sum.
+    """
     if levels.empty:
         return levels
     out = levels.copy()
-    last = out.index[-1]
-    for a in accounts:
-        if a in out.columns:
-            base = _float_scalar(out.at[last, a])
-            out.at[last, a] = base + float(up_map.get(a, 0.0))
+    cols = [a for a in accounts if a in out.columns]
+    if cols:
+        pos = out.columns.get_indexer(cols)
+        base = out.iloc[-1, pos].to_numpy(dtype="float64", na_value=np.nan, copy=True)
+        bump = np.array([float(up_map.get(a, 0.0)) for a in cols], dtype="float64")
+        # NaN levels (or uPnL) stay NaN, and the skipna row sum in `total` leaves them out
+        live = base + bump
+        out.iloc[-1, pos] = live
+        if "total" in out.columns:
+            delta = np.nansum(live) - np.nansum(base)
+            out.iloc[-1, out.columns.get_loc("total")] += float(delta)
     return out
 
 
@@ -158,7 +166,7 @@ def _live_returns_block(
     float,
 ]:
     """Compute live realized/margin returns (USD and %) per account and totals."""
-    last_ts = _last_index(fixed)
+    last_vals = dict(zip(accs, _last_row_values(fixed, accs).tolist(), strict=True))
     realized_usd: dict[str, float] = {}
     realized_pct: dict[str, float] = {}
     margin_usd: dict[str, float] = {}
@@ -166,9 +174,7 @@ def _live_returns_block(
 
     for a in accs:
         init = float(init_map.get(a, 0.0))
-        last_realized = (
-            _float_scalar(fixed.loc[last_ts, a]) if (last_ts and a in fixed.columns) else 0.0
-        )
+        last_realized = last_vals[a]
         upnl = float(up_map.get(a, 0.0))
         ujson = float(unreal_map.get(a, 0.0))
 
@@ -180,7 +186,7 @@ def _live_returns_block(
 
     init_total = float(sum(init_map.get(a, 0.0) for a in accs))
     unreal_total = float(sum(unreal_map.get(a, 0.0) for a in accs))
-    last_realized_total = _sum_row(fixed, last_ts, accs)
+    last_realized_total = float(sum(last_vals.values()))
     up_total = float(up_map.get("total", 0.0))
 
     live_total = last_realized_total + up_total
@@ -203,29 +209,42 @@ def _live_returns_block(
     )
 
 
+def _column_peaks(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """Running peak at the last row for each of ``cols``, from one reduction over the block.
+
+    Equals ``df[c].cummax().iloc[-1]`` per column (NaN where the last row is NaN).
+    Missing columns → 0.0.
+    """
+    if df.empty:
+        return np.zeros(len(cols), dtype="float64")
+    pos = df.columns.get_indexer(cols)
+    block = df.to_numpy(dtype="float64", na_value=np.nan)[:, pos[pos >= 0]]
+    peaks = np.zeros(len(cols), dtype="float64")
+    peaks[pos >= 0] = np.where(np.isnan(block[-1]), np.nan, np.fmax.reduce(block, axis=0))
+    return peaks
+
+
 def _current_dd_block(
     accs: list[str],
-    fixed: pd.DataFrame,
-    margin: pd.DataFrame,
+    fixed_total: pd.DataFrame,
+    margin_total: pd.DataFrame,
     up_map: dict[str, float],
 ) -> tuple[dict[str, float], dict[str, float]]:
-    """Compute current drawdown per account and totals for realized and margin."""
-    last_ts = _last_index(fixed)
-
-    fixed_total = fixed.assign(total=fixed[accs].sum(axis=1)) if not fixed.empty else fixed
-    margin_total = margin.assign(total=margin[accs].sum(axis=1)) if not margin.empty else margin
+    """Compute current drawdown per account and totals for realized and margin.
 
-    peak_fixed_total = (
-        _float_scalar(fixed_total["total"].cummax().iloc[-1]) if not fixed_total.empty else 0.0
-    )
-    peak_margin_total = (
-        _float_scalar(margin_total["total"].cummax().iloc[-1]) if not margin_total.empty else 0.0
-    )
+    Takes the frames that already carry the `total` column, so account and total peaks
+    come from the same reduction instead of re-summing every row.
+    """
+    last_fixed = _last_row_values(fixed_total, accs)
+    last_margin = _last_row_values(margin_total, accs)
+    peak_fixed = _column_peaks(fixed_total, [*accs, "total"])
+    peak_margin = _column_peaks(margin_total, [*accs, "total"])
+    peak_fixed_total, peak_fixed = float(peak_fixed[-1]), peak_fixed[:-1]
+    peak_margin_total, peak_margin = float(peak_margin[-1]), peak_margin[:-1]
 
-    last_realized_total = _sum_row(fixed, last_ts, accs)
-    up_total = float(up_map.get("total", 0.0))
-    curr_realized_total = last_realized_total + up_total
-    last_margin_total = _sum_row(margin, last_ts, accs)
+    up = np.array([float(up_map.get(a, 0.0)) for a in accs], dtype="float64")
+    curr_realized_total = float(last_fixed.sum()) + float(up_map.get("total", 0.0))
+    last_margin_total = float(last_margin.sum())
 
     curr_dd_realized_total = (
         ((curr_realized_total - peak_fixed_total) / peak_fixed_total) if peak_fixed_total else 0.0
@@ -234,28 +253,16 @@ def _current_dd_block(
         ((last_margin_total - peak_margin_total) / peak_margin_total) if peak_margin_total else 0.0
     )
 
-    current_dd_realized: dict[str, float] = {"total": curr_dd_realized_total}
-    current_dd_margin: dict[str, float] = {"total": curr_dd_margin_total}
-
-    for a in accs:
-        if not fixed.empty and a in fixed.columns:
-            peak_a = _float_scalar(fixed[a].cummax().iloc[-1])
-            live_a = (
-                (_float_scalar(fixed.loc[last_ts, a]) + float(up_map.get(a, 0.0)))
-                if last_ts
-                else 0.0
-            )
-            current_dd_realized[a] = (live_a - peak_a) / peak_a if peak_a else 0.0
-        else:
-            current_dd_realized[a] = 0.0
-
-        if not margin.empty and a in margin.columns:
-            peak_ma = _float_scalar(margin[a].cummax().iloc[-1])
-            live_ma = _float_scalar(margin.loc[last_ts, a]) if last_ts else 0.0
-            current_dd_margin[a] = (live_ma - peak_ma) / peak_ma if peak_ma else 0.0
-        else:
-            current_dd_margin[a] = 0.0
+    # (live - peak) / peak for every account at once; a zero peak gives 0.0
+    dd_fixed = np.zeros(len(accs), dtype="float64")
+    np.divide(last_fixed + up - peak_fixed, peak_fixed, out=dd_fixed, where=peak_fixed != 0.0)
+    dd_margin = np.zeros(len(accs), dtype="float64")
+    np.divide(last_margin - peak_margin, peak_margin, out=dd_margin, where=peak_margin != 0.0)
 
+    current_dd_realized = {"total": curr_dd_realized_total}
+    current_dd_realized.update(zip(accs, dd_fixed.tolist(), strict=True))
+    current_dd_margin = {"total": curr_dd_margin_total}
+    current_dd_margin.update(zip(accs, dd_margin.tolist(), strict=True))
     return current_dd_realized, current_dd_margin
 
 
@@ -298,13 +305,22 @@ def _find_accounts_json() -> Path | None:
 
 
 def _load_accounts_index() -> dict[str, AccountMeta]:
-    """Load accounts.json and index by lowercased redisName."""
+    """Load accounts.json and index by lowercased redisName (parsed once per file version)."""
     path = _find_accounts_json()
     if not path:
         return {}
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        items = cast(list[AccountMeta], data)
+        st = path.stat()
+    except OSError:
+        return {}
+    return _accounts_index(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1)
+def _accounts_index(path: str, _mtime_ns: int, _size: int) -> dict[str, AccountMeta]:
+    try:
+        with open(path, "rb") as f:
+            items = cast(list[AccountMeta], orjson.loads(f.read()))
     except Exception:
         return {}
     index: dict[str, AccountMeta] = {}
@@ -335,24 +351,41 @@ def _group_accounts_by_strategy(
 
 
 def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
-    """Return the full metrics payload for requested accounts."""
-    accs = [a.strip().lower() for a in accounts if a.strip()]
+    """Return the full metrics payload for requested accounts.
+
+    Payloads are cached for 5s per (accounts, MTD window); each call gets its own dict.
+    """
+    accs = tuple(a.strip().lower() for a in accounts if a.strip())
     start_day, today = _mtd_window_today()
-    print(f"start_day = {start_day}")
-    print(f"today = {today}")
+    key = (accs, start_day, today.normalize())
+    with _PAYLOAD_LOCK:
+        blob = _PAYLOAD_CACHE.get(key)
+    if blob is None:
+        payload = _build_metrics_payload(list(accs), start_day, today)
+        blob = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        with _PAYLOAD_LOCK:
+            _PAYLOAD_CACHE[key] = blob
+    return cast(dict[str, object], orjson.loads(blob))
+
+
+def _build_metrics_payload(
+    accs: list[str], start_day: pd.Timestamp, today: pd.Timestamp
+) -> dict[str, object]:
+    logger.debug("metrics window start_day=%s today=%s", start_day, today)
+
+    # The all-time DD rebuilds every ledger from the first snapshot and shares nothing
+    # with the MTD blocks, so it runs alongside them instead of after
+    all_time_dd = run_in_background(current_max_dd, accs, start_day, today)
 
     # Initial balances (SQL only)
-    init_map: dict[str, float] = {}
-    zero_initial: list[str] = []
-    for a in accs:
-        bal, _ts = nearest_balance_on_or_before(a, start_day)
-        init_map[a] = float(bal)
-        if bal == 0.0:
-            zero_initial.append(a)
+    init_map = dict(_day_open_balances(tuple(accs), start_day))
+    zero_initial = [a for a in accs if init_map[a] == 0.0]
 
     # Realized equity (SQL deltas + SQL initial), daily through today
-    fixed_delta, _ = build_fixed_balances(accs, start_day, today)
-    fixed = _offset_fixed_with_initial(fixed_delta, init_map, accs)
+    # Ledgers are read once per account and shared by equity, regular returns,
+    # losing days and symbol PnL
+    events, trades = read_ledgers(accs, start_day, today)
+    fixed, _ = build_fixed_balances(accs, start_day, today, events=events, initial=init_map)
 
     # Baselines and UPnL
     up_map = read_upnl(accs)  # {acc: upnl, ..., "total": ...}
@@ -365,12 +398,7 @@ def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
     fixed_total_pure = fixed.assign(total=fixed[accs].sum(axis=1)) if not fixed.empty else fixed
     mtd_ret_realized_pure = mtd_return(fixed_total_pure) if not fixed_total_pure.empty else {}
 
-    fixed_with_up = _inject_upnl_last_row(fixed, up_map, accs)
-    fixed_total_with_up = (
-        fixed_with_up.assign(total=fixed_with_up[accs].sum(axis=1))
-        if not fixed_with_up.empty
-        else fixed_with_up
-    )
+    fixed_total_with_up = _inject_upnl_last_row(fixed_total_pure, up_map, accs)
     mtd_ret_realized_with_upnl = (
         mtd_return(fixed_total_with_up) if not fixed_total_with_up.empty else {}
     )
@@ -392,14 +420,18 @@ def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
     ) = _live_returns_block(accs, fixed, init_map, up_map, unreal_map)
 
     # Drawdowns
-    current_dd_realized, current_dd_margin = _current_dd_block(accs, fixed, margin, up_map)
+    current_dd_realized, current_dd_margin = _current_dd_block(
+        accs, fixed_total_pure, margin_total, up_map
+    )
     mdd_fixed = mtd_max_dd_from_levels(fixed_total_pure) if not fixed_total_pure.empty else {}
     mdd_margin = mtd_max_dd_from_levels(margin_total) if not margin_total.empty else {}
 
     # Losing days and PnL by symbol
-    losing = losing_days_mtd(accs, day_start_hour=8, start_day=start_day, today=today)
+    losing = losing_days_mtd(
+        accs, day_start_hour=8, start_day=start_day, today=today, trades=trades
+    )
     symbols, totals_by_acc = pnl_by_symbol_mtd(
-        accs, start_day.isoformat(" "), str(today.isoformat(" "))
+        accs, start_day.isoformat(" "), str(today.isoformat(" ")), trades=trades
     )
 
     # Serialize equity blocks
@@ -407,7 +439,7 @@ def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
         _serialize_series(fixed_total_pure, accs) if not fixed_total_pure.empty else {}
     )
     margin_series = _serialize_series(margin_total, accs) if not margin_total.empty else {}
-    live_key = str(list(margin_total.index)[-1]) if not margin_total.empty else None
+    live_key = str(margin_total.index[-1]) if not margin_total.empty else None
     margin_live = {live_key: margin_series[live_key]} if live_key else {}
 
     # Initial balances blocks
@@ -445,36 +477,24 @@ def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
             else fixed_sub
         )
         up_sub = _subset_up(up_map, subset)
-        fixed_with_up_sub = _inject_upnl_last_row(fixed_sub, up_sub, subset)
-        fixed_total_with_up_sub = (
-            fixed_with_up_sub.assign(total=fixed_with_up_sub[subset].sum(axis=1))
-            if not fixed_with_up_sub.empty
-            else fixed_with_up_sub
-        )
+        fixed_total_with_up_sub = _inject_upnl_last_row(fixed_total_pure_sub, up_sub, subset)
         margin_total_sub = (
             margin_sub.assign(total=margin_sub[subset].sum(axis=1))
             if not margin_sub.empty
             else margin_sub
         )
 
-        levels_for_ret_realized = (
+        levels_realized = (
             fixed_total_with_up_sub if not fixed_total_with_up_sub.empty else fixed_total_pure_sub
         )
-        ret_realized_map = (
-            mtd_return(levels_for_ret_realized) if not levels_for_ret_realized.empty else {}
-        )
+        ret_realized_map = mtd_return(levels_realized) if not levels_realized.empty else {}
         ret_margin_map = mtd_return(margin_total_sub) if not margin_total_sub.empty else {}
 
         ret_realized = float(ret_realized_map.get("total", 0.0))
         ret_margin = float(ret_margin_map.get("total", 0.0))
 
-        levels_for_mdd_realized = (
-            fixed_total_with_up_sub if not fixed_total_with_up_sub.empty else fixed_total_pure_sub
-        )
         mdd_realized_map = (
-            mtd_max_dd_from_levels(levels_for_mdd_realized)
-            if not levels_for_mdd_realized.empty
-            else {}
+            mtd_max_dd_from_levels(levels_realized) if not levels_realized.empty else {}
         )
         mdd_margin_map = (
             mtd_max_dd_from_levels(margin_total_sub) if not margin_total_sub.empty else {}
@@ -496,11 +516,10 @@ def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
 
     # Regular returns + all-time DD
     regular_df = regular_returns_by_session(
-        accs, start_day, today, day_start_hour=8, tz="Asia/Manila"
+        accs, start_day, today, day_start_hour=8, tz="Asia/Manila", events=events
     )
     regular_returns = _serialize_series(regular_df, accs) if not regular_df.empty else {}
-    # all_time_dd = compute_all_time_max_current_dd(accs)
-    current_dd_val, max_dd_val = current_max_dd(accs, oct_start=start_day, end_day=today)
+    current_dd_val, max_dd_val = all_time_dd.result()
 
     payload: dict[str, object] = {
         "meta": {
@@ -537,7 +556,7 @@ def build_metrics_payload(accounts: Sequence[str]) -> dict[str, object]:
         },
         "losingDays": losing,
         "symbolPnlMTD": {"symbols": symbols, "totalPerAccount": totals_by_acc},
-        "uPnl": upnl_payload(accs),
+        "uPnl": upnl_payload(accs, up_map),
         "performanceByStrategy": performance_by_strategy,
         "regular_returns": regular_returns,
         "all_time_max_current_dd": {
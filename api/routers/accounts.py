@@ -3,19 +3,50 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
+import hashlib
+
+import orjson
+from fastapi import APIRouter, Query, Request, Response
 
 from ..db.accounts import get_accounts as _get_accounts
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
+_CACHE_HEADERS = {"Cache-Control": "private, max-age=30"}
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list (or `*`) against `etag`.
 
-@router.get("", summary="List available accounts")
+    Proxies and compressing middleware may weaken the validator to W/"...", so the
+    prefix is ignored on both sides.
+    """
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in {t.removeprefix("W/") for t in tags}
+
+
+@router.get(
+    "",
+    summary="List available accounts",
+    response_model=dict[str, list[dict[str, object]]],
+    responses={304: {"description": "Not modified since the ETag in If-None-Match"}},
+)
 def list_accounts(
+    request: Request,
     monitored: bool = Query(
         default=False,
         description="If true, only return accounts with monitored=true",
     ),
-) -> dict[str, list[dict[str, object]]]:
-    """Return accounts from api/data/accounts.json (or ACCOUNTS_JSON_PATH override)."""
-    return {"accounts": _get_accounts(monitored_only=monitored)}
+) -> Response:
+    """Return accounts from api/data/accounts.json (or ACCOUNTS_JSON_PATH override).
+
+    Responses carry a content ETag; a matching If-None-Match gets an empty 304.
+    """
+    body = orjson.dumps({"accounts": _get_accounts(monitored_only=monitored)})
+    etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    headers = {**_CACHE_HEADERS, "ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -5,16 +5,21 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
 from ..metrics.performance_metrics.performance_metrics import build_metrics_payload
 
 router = APIRouter(prefix="/performance_metrics", tags=["performance_metrics"])
 
+# Matches the 5s server-side payload cache, so a client re-poll inside it stays local
+_CACHE_HEADERS = {"Cache-Control": "private, max-age=5"}
+
 
 @router.get("", summary="Build performance metrics payload for given accounts")
 def get_performance_metric(
+    response: Response,
     accounts: Annotated[list[str], Query(description="Account ids", min_length=1)],
 ) -> dict[str, object]:
     """Return a combined performance metrics payload for the requested accounts."""
+    response.headers.update(_CACHE_HEADERS)
     return build_metrics_payload(accounts)
@@ -0,0 +1 @@
+"""API unit tests."""
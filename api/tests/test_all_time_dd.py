@@ -0,0 +1,59 @@
+# api/tests/test_all_time_dd.py
+"""current_max_dd on stubbed balance tables and daily frames."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from ..metrics.performance_metrics.calculations import all_time_dd
+
+_DAYS = pd.date_range("2025-01-01", periods=4, freq="D")
+_LEVELS = [100.0, 80.0, 120.0, 110.0]
+
+
+def _daily(start: pd.Timestamp) -> pd.DataFrame:
+    keep = _DAYS >= pd.Timestamp(start)
+    return pd.DataFrame(
+        {"date": _DAYS[keep].strftime("%Y-%m-%d"), "end_balance_combined": pd.Series(_LEVELS)[keep]}
+    ).reset_index(drop=True)
+
+
+@pytest.fixture
+def stubbed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Two accounts whose histories start on different days; the older one is listed first."""
+    firsts = {"old": _DAYS[0], "new": _DAYS[2]}
+    monkeypatch.setattr(
+        all_time_dd,
+        "get_data",
+        lambda acc, tb_name, db_name: pd.DataFrame({"datetime": [firsts[acc]]}),
+    )
+    monkeypatch.setattr(
+        all_time_dd,
+        "process_df",
+        lambda accs, start, end: (None, _daily(start), None),
+    )
+
+
+@pytest.mark.usefixtures("stubbed")
+def test_window_drawdown_uses_full_history_peak_up_to_window_end() -> None:
+    """The window's last level is compared with the full-history peak up to that date."""
+    current_dd, max_dd_all = all_time_dd.current_max_dd(["old", "new"], _DAYS[2], _DAYS[-1])
+
+    # Peak through the window's last day is 120, not a positional lookup into history
+    assert current_dd == pytest.approx(110.0 / 120.0 - 1.0)
+    assert max_dd_all == pytest.approx(80.0 / 100.0 - 1.0)
+
+
+@pytest.mark.usefixtures("stubbed")
+def test_empty_window_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A window without daily rows raises ValueError instead of IndexError."""
+    window_start = _DAYS[2]
+    empty = _daily(_DAYS[-1] + pd.Timedelta(days=1))
+    monkeypatch.setattr(
+        all_time_dd,
+        "process_df",
+        lambda accs, start, end: (None, empty if start == window_start else _daily(start), None),
+    )
+    with pytest.raises(ValueError, match="window"):
+        all_time_dd.current_max_dd(["old", "new"], window_start, _DAYS[-1])
@@ -0,0 +1,131 @@
+# api/tests/test_equity.py
+"""Daily bucketing against pandas resample, and the Redis ledger cache encoding."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..db.sql import TradeColumns
+from ..metrics.performance_metrics.calculations import equity
+
+_IDX = pd.date_range("2025-03-01", periods=10, freq="D")
+
+
+def _random_events(seed: int, n: int) -> pd.Series:
+    """Event PnL at random stamps spanning a little before and after `_IDX`."""
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(-2 * 86_400, 12 * 86_400, size=n)
+    stamps = pd.DatetimeIndex(_IDX[0] + pd.to_timedelta(np.sort(offsets), unit="s"))
+    vals = rng.normal(size=n)
+    vals[rng.random(n) < 0.1] = np.nan
+    return pd.Series(vals, index=stamps, dtype="float64")
+
+
+def _resampled(events: pd.Series) -> np.ndarray:
+    """Reference: pandas daily sum, reindexed onto `_IDX`."""
+    if events.empty:
+        return np.zeros(len(_IDX))
+    return events.resample("D").sum().reindex(_IDX, fill_value=0.0).to_numpy("float64")
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bucket_by_day_matches_resample(seed: int) -> None:
+    """Out-of-window stamps are dropped and NaN counts as 0, as with resample().sum()."""
+    events = _random_events(seed, 200)
+    got = equity.bucket_by_day(
+        events.index.as_unit("ns").asi8, events.to_numpy(), _IDX[0].value, len(_IDX)
+    )
+    np.testing.assert_allclose(got, _resampled(events), atol=1e-12)
+
+
+def test_bucket_by_day_empty() -> None:
+    """No stamps, or no days, give an all-zero result of the requested length."""
+    empty = np.array([], dtype="int64")
+    assert equity.bucket_by_day(empty, np.array([]), _IDX[0].value, 3).tolist() == [0.0] * 3
+    assert equity.bucket_by_day(np.array([_IDX[0].value]), np.array([1.0]), 0, 0).size == 0
+
+
+def test_daily_bucket_block_matches_per_account_resample() -> None:
+    """Column j is account j's daily sum, in `accounts` order; an empty account stays zero."""
+    events = {
+        "a": _random_events(1, 150),
+        "b": _random_events(2, 80),
+        "empty": pd.Series(dtype="float64", index=pd.DatetimeIndex([])),
+    }
+    accounts = ["b", "empty", "a"]
+
+    block = equity.daily_bucket_block(events, accounts, _IDX)
+
+    assert block.shape == (len(_IDX), len(accounts))
+    assert block.flags.f_contiguous
+    for j, acc in enumerate(accounts):
+        want = _resampled(events[acc])
+        np.testing.assert_allclose(block[:, j], want, atol=1e-12)
+
+
+def _trades_frame() -> pd.DataFrame:
+    stamps = pd.DatetimeIndex(["2025-03-02 10:00", "2025-03-03 11:30"], name="time")
+    return pd.DataFrame({"symbol": ["BTCUSDT", None], "realizedPnl": [1.25, -0.5]}, index=stamps)
+
+
+def test_ledger_round_trip() -> None:
+    """Decoding an encoded ledger gives back the same events and trade columns."""
+    trades = equity.trade_columns(_trades_frame())
+    events = _random_events(3, 20)
+
+    got_events, got_trades = equity._decode_ledger(equity._encode_ledger(events, trades))
+
+    # Stamps travel as epoch-ns, so the decoded index is always ns resolution
+    np.testing.assert_array_equal(got_events.index.asi8, events.index.as_unit("ns").asi8)
+    np.testing.assert_array_equal(got_events.to_numpy(), events.to_numpy())
+    np.testing.assert_array_equal(got_trades.ts_ns, trades.ts_ns)
+    np.testing.assert_array_equal(got_trades.pnl, trades.pnl)
+    assert got_trades.symbol.tolist() == ["BTCUSDT", ""]
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [b'{"ev_ts": [1, 2', b'{"ev_ts": [], "ev": []}', b"[1, 2, 3]", b'"foreign"', b"\xff"],
+)
+def test_corrupt_cached_ledger_is_read_from_sql(
+    monkeypatch: pytest.MonkeyPatch, blob: bytes
+) -> None:
+    """An undecodable cache entry is treated as a miss; a valid one skips SQL."""
+    cached = equity._encode_ledger(
+        pd.Series([2.0], index=pd.DatetimeIndex(["2025-03-01 09:00"])),
+        TradeColumns(np.array([], "int64"), np.array([], "float64"), np.array([], object)),
+    )
+    read: list[str] = []
+
+    def _trades(acc: str, start_dt: str, end_dt: str) -> pd.DataFrame:
+        read.append(acc)
+        return _trades_frame()
+
+    written: dict[str, bytes] = {}
+    monkeypatch.setattr(equity, "LEDGER_CACHE_TTL", 30)
+    monkeypatch.setattr(equity, "cache_get_many", lambda keys: [blob, cached])
+    monkeypatch.setattr(equity, "cache_set_many", lambda items, ttl: written.update(items))
+    monkeypatch.setattr(equity, "read_trades", _trades)
+    monkeypatch.setattr(
+        equity,
+        "read_transactions",
+        lambda *a: pd.DataFrame(columns=["incomeType", "income"], index=pd.DatetimeIndex([])),
+    )
+    monkeypatch.setattr(
+        equity,
+        "read_earnings",
+        lambda *a: pd.DataFrame(columns=["rewards"], index=pd.DatetimeIndex([])),
+    )
+
+    events, trades = equity.read_ledgers(
+        ["bad", "good"], pd.Timestamp("2025-03-01"), pd.Timestamp("2025-03-10")
+    )
+
+    assert read == ["bad"]
+    assert events["bad"].tolist() == [1.25, -0.5]
+    assert trades["bad"].symbol.tolist() == ["BTCUSDT", ""]
+    assert events["good"].tolist() == [2.0]
+    assert trades["good"].empty
+    assert [k.split(":")[1] for k in written] == ["bad"]
@@ -0,0 +1,60 @@
+# api/tests/test_losing_days.py
+"""_losing_streaks against the per-series scan it replaced."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ..metrics.performance_metrics.calculations.losing_days import _losing_streaks
+
+_EPS = 1e-9
+
+
+def _loop_streak(vals: list[float]) -> tuple[int, int]:
+    """Reference scan: skip trailing ~0 days, then count strict losses backwards."""
+    i = len(vals) - 1
+    while i >= 0 and abs(vals[i]) <= _EPS:
+        i -= 1
+    if i < 0:
+        return 0, -1
+    end = i
+    streak = 0
+    while i >= 0 and vals[i] < -_EPS:
+        streak += 1
+        i -= 1
+    return streak, end
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_loop_on_random_rows(seed: int) -> None:
+    """Streak and tail position agree with the loop, zeros and tiny values included."""
+    rng = np.random.default_rng(seed)
+    n_rows, n_days = int(rng.integers(1, 8)), int(rng.integers(1, 40))
+    daily = rng.choice([-2.0, -1e-12, 0.0, 1e-12, 1.5], size=(n_rows, n_days))
+
+    streaks, ends = _losing_streaks(daily, eps=_EPS)
+
+    for row in range(n_rows):
+        streak, end = _loop_streak(daily[row].tolist())
+        assert int(streaks[row]) == streak
+        if streak:
+            assert int(ends[row]) == end
+
+
+def test_all_zero_and_empty_rows() -> None:
+    """Rows with no non-zero day, and a matrix with no days, give zero streaks."""
+    streaks, _ = _losing_streaks(np.zeros((2, 5)))
+    assert streaks.tolist() == [0, 0]
+
+    streaks, ends = _losing_streaks(np.zeros((3, 0)))
+    assert streaks.tolist() == [0, 0, 0]
+    assert ends.tolist() == [0, 0, 0]
+
+
+def test_trailing_zeros_are_skipped() -> None:
+    """Losses before trailing zeros still count; a gain breaks the run."""
+    daily = np.array([[1.0, -1.0, -2.0, 0.0, 0.0], [-1.0, 3.0, -1.0, -1.0, -1.0]])
+    streaks, ends = _losing_streaks(daily)
+    assert streaks.tolist() == [2, 3]
+    assert ends.tolist() == [2, 4]
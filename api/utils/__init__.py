@@ -1,2 +1,2 @@
 # api\utils\__init__.py
-"""Small utilities (datetime, numbers, balance)."""
+"""Small utilities (datetime, numbers, balance, concurrency)."""
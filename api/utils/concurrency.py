@@ -0,0 +1,42 @@
+# api/utils/concurrency.py
+"""Thread-pool helpers for I/O-bound per-account fan-out."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from ..core.config import SQL_MAX_WORKERS
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+# One process-wide pool, sized like the SQL connection pool: requests share warm threads
+# instead of spawning a pool each, and concurrent requests cannot oversubscribe the engine.
+# Do not call map_accounts from inside a mapped function; nested waits could exhaust it.
+_POOL = ThreadPoolExecutor(max_workers=SQL_MAX_WORKERS, thread_name_prefix="accounts")
+
+
+def map_accounts(fn: Callable[[K], T], accounts: Iterable[K]) -> dict[K, T]:
+    """Run `fn(account)` concurrently and return {account: result} in input order.
+
+    SQL/Redis drivers release the GIL while waiting on the socket, so wall time
+    approaches the slowest account instead of the sum over accounts. Keys may be any
+    hashable job id, e.g. (account, table) pairs to overlap several reads per account.
+    """
+    accs = list(accounts)
+    if len(accs) <= 1:
+        return {a: fn(a) for a in accs}
+    return dict(zip(accs, _POOL.map(fn, accs), strict=True))
+
+
+# Whole request stages (e.g. the full-history drawdown rebuild) run here so they overlap
+# with the rest of the request. These threads are not in _POOL, so a stage may fan out
+# through map_accounts without nesting.
+_STAGES = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stages")
+
+
+def run_in_background(fn: Callable[..., T], *args: object) -> Future[T]:
+    """Start `fn(*args)` on the stage pool; `.result()` returns its value or re-raises."""
+    return _STAGES.submit(fn, *args)